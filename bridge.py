@@ -1,54 +1,191 @@
+import asyncio
+import functools
 import json
 import importlib
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Upper bound on threads used to import plugin modules concurrently
+MAX_IMPORT_WORKERS = 8
+
+MANIFEST_FILENAME = "plugin.json"
+# Cached list of every plugin manifest, rebuilt when any manifest changes
+INDEX_FILENAME = "_index.json"
+
+# Upper bound (seconds) on one tool call, by tool-name prefix, so a hung API
+# or AppleScript call can't stall the runtime indefinitely. A tool can set its
+# own "timeout" instead (see PluginAPI.register_tool).
+TOOL_TIMEOUTS = {
+    "gmail_": 30.0,
+    "calendar_": 30.0,
+    # Above plugins/_osascript.py TIMEOUT_SECONDS (30), plus pool queueing
+    "notes_": 45.0,
+    "reminders_": 45.0,
+}
+DEFAULT_TOOL_TIMEOUT = 30.0
+
+
+def _tool_timeout(name: str) -> float:
+    for prefix, timeout in TOOL_TIMEOUTS.items():
+        if name.startswith(prefix):
+            return timeout
+    return DEFAULT_TOOL_TIMEOUT
+
+
+def _with_timeout(name: str, fn, timeout):
+    """Wrap fn with a timeout: seconds, None for no limit, or a callable
+    returning either, evaluated per call."""
+
+    @functools.wraps(fn)
+    async def call(*args, **kwargs):
+        limit = timeout() if callable(timeout) else timeout
+        if limit is None:
+            return await fn(*args, **kwargs)
+        try:
+            return await asyncio.wait_for(fn(*args, **kwargs), limit)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{name} timed out after {limit:g}s") from None
+
+    return call
+
+
 class PluginAPI:
     def __init__(self, plugin_config, tools):
         self.plugin_config = plugin_config
         self._tools = tools
 
     def register_tool(self, tool):
-        self._tools.append(tool)
+        """Register a tool dict {name, description, fn[, timeout]}.
 
+        "timeout" overrides TOOL_TIMEOUTS for this tool. None means no limit:
+        use it for tools that change state, since a timeout can't stop work
+        already running in a thread, and a retry would repeat it.
+        """
+        tool = dict(tool)
+        timeout = tool.pop("timeout", _tool_timeout(tool["name"]))
+        self._tools.append({**tool, "fn": _with_timeout(tool["name"], tool["fn"], timeout)})
 
-def load_plugins(plugins_dir: str, user_config: dict):
-    tools = []
 
-    plugins_path = Path(plugins_dir)
+def _scan_manifests(plugins_path):
+    """Read every plugin.json and return index entries {id, dir, platforms}."""
+    index = []
 
-    for plugin_dir in plugins_path.iterdir():
-        if not plugin_dir.is_dir():
-            continue
+    # scandir entries carry their d_type, so is_dir() needs no extra stat
+    with os.scandir(plugins_path) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
 
-        manifest_path = plugin_dir / "plugin.json"
-        if not manifest_path.exists():
-            continue
+            try:
+                with open(os.path.join(entry.path, MANIFEST_FILENAME), "rb") as f:
+                    manifest = json.loads(f.read())
+            except FileNotFoundError:
+                continue
+
+            index.append({
+                "id": manifest["id"],
+                "dir": entry.name,
+                "platforms": manifest.get("platforms"),
+            })
+
+    return index
+
+
+def _index_is_fresh(plugins_path, index, index_mtime):
+    # Adding/removing a plugin bumps the directory mtime; editing one bumps its manifest.
+    if os.stat(plugins_path).st_mtime > index_mtime:
+        return False
+    for plugin in index:
+        manifest_path = os.path.join(plugins_path, plugin["dir"], MANIFEST_FILENAME)
+        if os.stat(manifest_path).st_mtime > index_mtime:
+            return False
+    return True
+
+
+def _load_index(plugins_path):
+    """Return the cached manifest index, rebuilding it when stale or missing."""
+    index_path = os.path.join(plugins_path, INDEX_FILENAME)
 
-        manifest = json.loads(manifest_path.read_text())
-        plugin_id = manifest["id"]
+    try:
+        index_mtime = os.stat(index_path).st_mtime
+        with open(index_path, "rb") as f:
+            index = json.loads(f.read())
+        if _index_is_fresh(plugins_path, index, index_mtime):
+            return index
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    index = _scan_manifests(plugins_path)
+
+    try:
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        # The rename itself bumps the directory mtime; keep the index newer.
+        os.utime(index_path)
+    except OSError:
+        # Read-only install: still works, just without the cache.
+        pass
+
+    return index
+
+
+def _enabled_plugins(plugins_path, user_config: dict):
+    """Return (dir_name, plugin_id) for plugins to load."""
+    enabled = []
+
+    for plugin in _load_index(plugins_path):
+        plugin_id = plugin["id"]
 
         if plugin_id not in user_config:
             continue
 
         # Only load on allowed platforms (e.g. ["darwin"] for Mac-only)
-        platforms = manifest.get("platforms")
+        platforms = plugin["platforms"]
         if platforms is not None and sys.platform not in platforms:
             continue
 
-        try:
-            module = importlib.import_module(f"plugins.{plugin_dir.name}")
-
-            api = PluginAPI(
-                plugin_config=user_config[plugin_id],
-                tools=tools,
-            )
-
-            module.register(api)
-        except Exception as exc:
-            # Plugin dependencies can be optional (e.g. Google OAuth libs).
-            # Skip failed plugins so other tools can still load.
-            print(f"[bridge] Skipping plugin '{plugin_id}' due to error: {exc}", file=sys.stderr)
-            continue
+        enabled.append((plugin["dir"], plugin_id))
+
+    return enabled
+
+
+def _import_plugin(dir_name: str):
+    return importlib.import_module(f"plugins.{dir_name}")
+
+
+def load_plugins(plugins_dir: str, user_config: dict):
+    tools = []
+
+    enabled = _enabled_plugins(Path(plugins_dir), user_config)
+    if not enabled:
+        return tools
+
+    # Imports (e.g. googleapiclient) dominate startup, so run them in parallel.
+    # Registration stays on this thread since it mutates the shared tools list.
+    with ThreadPoolExecutor(max_workers=min(MAX_IMPORT_WORKERS, len(enabled))) as executor:
+        pending = [
+            (plugin_id, executor.submit(_import_plugin, dir_name))
+            for dir_name, plugin_id in enabled
+        ]
+
+        for plugin_id, future in pending:
+            try:
+                module = future.result()
+
+                api = PluginAPI(
+                    plugin_config=user_config[plugin_id],
+                    tools=tools,
+                )
+
+                module.register(api)
+            except Exception as exc:
+                # Plugin dependencies can be optional (e.g. Google OAuth libs).
+                # Skip failed plugins so other tools can still load.
+                print(f"[bridge] Skipping plugin '{plugin_id}' due to error: {exc}", file=sys.stderr)
+                continue
 
-    return tools
\ No newline at end of file
+    return tools
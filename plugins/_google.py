@@ -0,0 +1,185 @@
+"""Shared Google API client for the Gmail and Calendar plugins.
+
+Handles OAuth (token file plus the installed-app consent flow), builds each
+API service once, and gives every worker thread its own authorized HTTP
+client. Plugins pass in their own scopes and discovery directory.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Per-call limit for read tools once the service is authorized
+TOOL_TIMEOUT_SECONDS = 30.0
+
+# Socket timeout for API requests, so calls without a tool timeout (sends,
+# creates, deletes) still can't hang forever
+HTTP_TIMEOUT_SECONDS = 60
+
+# Built services keyed by (api_name, api_version, token_path)
+_SERVICE_CACHE = {}
+
+# Per-thread authorized HTTP clients: httplib2.Http is not thread-safe, but
+# tools run API calls on worker threads (e.g. concurrent batch chunks).
+_thread_local = threading.local()
+
+
+# google-auth treats tokens as expired minutes early; we only refresh this close to expiry
+_REFRESH_SKEW = timedelta(seconds=10)
+
+
+def _needs_refresh(creds):
+    if creds.token is None:
+        return True
+    if creds.expiry is None:
+        return False
+    # google-auth stores expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now >= creds.expiry - _REFRESH_SKEW
+
+
+def _load_credentials(credentials_path, token_path, scopes):
+    """Load saved credentials, refreshing or re-authorizing when they're unusable.
+
+    A saved token is used until _REFRESH_SKEW before it expires; after that,
+    AuthorizedHttp refreshes it itself before a request.
+    """
+    # Google client libraries are heavy; import them only when a service is built.
+    from google.auth.exceptions import RefreshError
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    creds = None
+
+    if token_path.exists():
+        creds = Credentials.from_authorized_user_file(token_path, scopes)
+
+    if creds is not None and _needs_refresh(creds):
+        if not creds.refresh_token:
+            # Expired and can't be refreshed; ask for consent again
+            creds = None
+        else:
+            previous = (creds.token, creds.expiry)
+            try:
+                creds.refresh(Request())
+            except RefreshError:
+                # Refresh token revoked or expired
+                creds = None
+            else:
+                if (creds.token, creds.expiry) != previous:
+                    token_path.write_text(creds.to_json())
+
+    if creds is None:
+        flow = InstalledAppFlow.from_client_secrets_file(
+            credentials_path,
+            scopes
+        )
+        creds = flow.run_local_server(port=0)
+        token_path.write_text(creds.to_json())
+
+    return creds
+
+
+def _thread_http(creds):
+    """Return this thread's AuthorizedHttp for creds, reusing its connections."""
+    import google_auth_httplib2
+    import httplib2
+
+    clients = getattr(_thread_local, "clients", None)
+    if clients is None:
+        clients = _thread_local.clients = {}
+    http = clients.get(id(creds))
+    if http is None:
+        http = clients[id(creds)] = google_auth_httplib2.AuthorizedHttp(
+            creds, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+        )
+    return http
+
+
+def _request_builder(creds):
+    from googleapiclient.http import HttpRequest
+
+    def build_request(http, *args, **kwargs):
+        # Ignore the service-wide http and use the calling thread's client
+        return HttpRequest(_thread_http(creds), *args, **kwargs)
+
+    return build_request
+
+
+def get_google_service(api_name, api_version, credentials_path, token_path, scopes, discovery_dir=None):
+    """Build (once per api/version/token file) an authorized Google API service.
+
+    scopes are the plugin's OAuth scopes; discovery_dir may hold pre-shipped
+    discovery documents named <api_name>.<api_version>.json.
+    """
+    credentials_path = Path(credentials_path)
+    token_path = Path(token_path)
+
+    cache_key = (api_name, api_version, str(token_path))
+    service = _SERVICE_CACHE.get(cache_key)
+    if service is not None:
+        return service
+
+    from googleapiclient.discovery import build, build_from_document
+
+    creds = _load_credentials(credentials_path, token_path, scopes)
+
+    http_options = {
+        "http": _thread_http(creds),
+        "requestBuilder": _request_builder(creds),
+    }
+
+    discovery_path = Path(discovery_dir) / f"{api_name}.{api_version}.json" if discovery_dir else None
+    if discovery_path is not None and discovery_path.exists():
+        service = build_from_document(discovery_path.read_text(), **http_options)
+    else:
+        # Static discovery uses the documents bundled with googleapiclient,
+        # so no discovery HTTP round-trip is made.
+        service = build(
+            api_name,
+            api_version,
+            static_discovery=True,
+            cache_discovery=False,
+            **http_options,
+        )
+
+    _SERVICE_CACHE[cache_key] = service
+    return service
+
+
+class LazyService:
+    """Proxy that builds the Google service on first attribute access.
+
+    Lets register() hand tools a service without paying for OAuth and
+    discovery until a tool is actually called.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._service = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self._factory()
+        return self._service
+
+    @property
+    def ready(self):
+        """True once the service is built (OAuth included)."""
+        return self._service is not None
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+def read_timeout(service):
+    """Tool "timeout" for a read-only Google tool.
+
+    No limit until service is built: the first call may be running the
+    interactive OAuth consent flow in the browser.
+    """
+    return lambda: TOOL_TIMEOUT_SECONDS if service.ready else None
@@ -0,0 +1,191 @@
+"""Shared AppleScript runner for the macOS plugins (Notes, Reminders) and
+the desktop executor (pylink/core/executor/os_control.py).
+
+Scripts are executed by long-lived ``osascript`` workers instead of a new
+process per call. A worker is a small JXA loop that reads one JSON-encoded
+script per line on stdin, runs it through ``NSAppleScript`` and answers with
+one JSON line on stdout. If the worker cannot be started or has died, calls
+fall back to a one-shot ``osascript -e``.
+
+Async callers go through :func:`run` / :func:`run_in_pool`, which use a
+dedicated thread pool (so slow AppleScript waits don't occupy the default
+executor); each pool thread keeps its own worker process.
+"""
+
+import asyncio
+import json
+import select
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TIMEOUT_SECONDS = 30
+
+_WORKER_SOURCE = r"""
+ObjC.import("Foundation");
+
+var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+var stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+
+function toText(desc) {
+    if (!desc || desc.isNil()) {
+        return "";
+    }
+    // typeAEList ('list'): join items the way osascript prints them
+    if (desc.descriptorType === 0x6c697374) {
+        var parts = [];
+        for (var i = 1; i <= desc.numberOfItems; i++) {
+            parts.push(toText(desc.descriptorAtIndex(i)));
+        }
+        return parts.join(", ");
+    }
+    var text = desc.stringValue;
+    return text && !text.isNil() ? ObjC.unwrap(text) : "";
+}
+
+function reply(payload) {
+    var line = $(JSON.stringify(payload) + "\n");
+    stdout.writeData(line.dataUsingEncoding($.NSUTF8StringEncoding));
+}
+
+function run() {
+    var buffer = "";
+    while (true) {
+        var data = stdin.availableData;
+        if (data.length === 0) {
+            return;
+        }
+        buffer += ObjC.unwrap($.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding));
+        var newline;
+        while ((newline = buffer.indexOf("\n")) >= 0) {
+            var source = JSON.parse(buffer.slice(0, newline));
+            buffer = buffer.slice(newline + 1);
+            var error = $();
+            var script = $.NSAppleScript.alloc.initWithSource(source);
+            var result = script.executeAndReturnError(error);
+            if (result.isNil()) {
+                var info = ObjC.deepUnwrap(error);
+                reply({ok: false, error: (info && info.NSAppleScriptErrorMessage) || "AppleScript failed"});
+            } else {
+                reply({ok: true, result: toText(result)});
+            }
+        }
+    }
+}
+"""
+
+POOL_WORKERS = 4
+
+_pool = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix="osascript")
+# One worker process per thread, so calls never share a pipe
+_local = threading.local()
+
+
+class AppleScriptTimeout(TimeoutError):
+    """The script didn't finish within its timeout."""
+
+
+def escape(s: str) -> str:
+    # Not cached: note and reminder bodies are mostly unique and can be long
+    if "\\" not in s and '"' not in s:
+        return s
+    return s.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def names_script(app: str, expression: str) -> str:
+    """Build a script returning a list expression as one item per line.
+
+    Joining with linefeed (instead of osascript's ", ") keeps names that
+    contain commas intact, so callers can simply use str.splitlines().
+    """
+    return (
+        f'tell application "{app}"\n'
+        f"  set AppleScript's text item delimiters to linefeed\n"
+        f"  set joined to ({expression}) as text\n"
+        f'  set AppleScript\'s text item delimiters to ""\n'
+        f"  return joined\n"
+        f"end tell"
+    )
+
+
+def _start_worker():
+    return subprocess.Popen(
+        ["osascript", "-l", "JavaScript", "-e", _WORKER_SOURCE],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _stop_worker() -> None:
+    worker = getattr(_local, "worker", None)
+    if worker is not None:
+        _local.worker = None
+        worker.kill()
+        try:
+            # Reap it, so stopped workers don't linger as zombies
+            worker.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+def _run_oneshot(script: str, timeout: float) -> str:
+    try:
+        result = subprocess.run(
+            ["osascript", "-e", script],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise AppleScriptTimeout("AppleScript timed out") from None
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr or result.stdout or "AppleScript failed")
+    return (result.stdout or "").strip()
+
+
+def run_applescript(script: str, timeout: float = TIMEOUT_SECONDS) -> str:
+    """Run AppleScript source and return its result as text.
+
+    Raises AppleScriptTimeout (a TimeoutError) if it doesn't finish in time,
+    RuntimeError if the script fails.
+    """
+    worker = getattr(_local, "worker", None)
+    if worker is None or worker.poll() is not None:
+        try:
+            worker = _local.worker = _start_worker()
+        except OSError:
+            _local.worker = None
+            return _run_oneshot(script, timeout)
+
+    try:
+        worker.stdin.write(json.dumps(script).encode("utf-8") + b"\n")
+        worker.stdin.flush()
+    except OSError:
+        # Worker died before receiving the script; safe to run it once here.
+        _stop_worker()
+        return _run_oneshot(script, timeout)
+
+    ready, _, _ = select.select([worker.stdout], [], [], timeout)
+    line = worker.stdout.readline() if ready else b""
+    if not line:
+        # Either way the worker is unusable: a late reply would arrive out of order
+        _stop_worker()
+        if not ready:
+            raise AppleScriptTimeout("AppleScript timed out")
+        raise RuntimeError("AppleScript worker exited")
+
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error") or "AppleScript failed")
+    return (response.get("result") or "").strip()
+
+
+async def run_in_pool(fn, *args):
+    """Run a blocking AppleScript helper on the dedicated osascript pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool, fn, *args)
+
+
+async def run(script: str) -> str:
+    return await run_in_pool(run_applescript, script)
@@ -1,5 +1,10 @@
-from .client import get_google_service
-from .tools import list_events_tool, create_event_tool, delete_event_tool
+from .tools import (
+    list_events_tool,
+    create_event_tool,
+    create_events_tool,
+    delete_event_tool,
+    delete_events_tool,
+)
 
 def register(api):
     cfg = api.plugin_config
@@ -9,13 +14,19 @@ def register(api):
         # Plugin enabled but not configured; don't register tools.
         return
 
-    service = get_google_service(
+    from .client import LazyService, get_google_service, read_timeout
+
+    service = LazyService(lambda: get_google_service(
         api_name="calendar",
         api_version="v3",
         credentials_path=credentials_path,
-        token_path=cfg.get("token_path", "token.json")
-    )
+        token_path=cfg.get("token_path", "token.json"),
+    ))
+    # Read tools run uncapped until the first call has finished OAuth
+    timeout = read_timeout(service)
 
-    api.register_tool(list_events_tool(service))
+    api.register_tool({**list_events_tool(service), "timeout": timeout})
     api.register_tool(create_event_tool(service))
     api.register_tool(delete_event_tool(service))
+    api.register_tool(create_events_tool(service))
+    api.register_tool(delete_events_tool(service))
@@ -1,17 +1,66 @@
+import asyncio
 from datetime import datetime, timezone
 
+# Calls per multipart batch request
+_BATCH_LIMIT = 50
+
+# Fields every event passed to calendar_create_events needs
+_EVENT_FIELDS = ("summary", "start_iso", "end_iso")
+
+# Partial-response masks: only request what the tools return
+_LIST_FIELDS = "items(id,summary,start,end)"
+_CREATE_FIELDS = "id,htmlLink"
+
+
+def _batch_error(results, request_id):
+    """Error text for a request that didn't succeed in a batch, else None."""
+    if request_id not in results:
+        return "No response for this request"
+    result = results[request_id]
+    # Successful deletes have an empty response, so test for failure explicitly
+    if isinstance(result, Exception):
+        return str(result)
+    return None
+
+
+def _chunks(items):
+    return [items[i:i + _BATCH_LIMIT] for i in range(0, len(items), _BATCH_LIMIT)]
+
+
+def _execute_batch(service, make_request, items):
+    """Run make_request(arg) for (request_id, arg) items as one batch.
+
+    Requests are built on the calling (worker) thread so they use that
+    thread's HTTP client. Returns {request_id: response} for successes and
+    {request_id: exception} for failures.
+    """
+    results = {}
+
+    def on_response(request_id, response, exception):
+        results[request_id] = response if exception is None else exception
+
+    batch = service.new_batch_http_request(callback=on_response)
+    for request_id, arg in items:
+        batch.add(make_request(arg), request_id=request_id)
+    batch.execute()
+    return results
+
+
 def list_events_tool(service):
     async def list_events(max_results: int = 10):
         now = datetime.now(timezone.utc).isoformat()
 
-        events = (
-            service.events()
+        # execute() blocks on HTTP; keep it (and the request build, which
+        # picks the thread's HTTP client) off the event loop.
+        events = await asyncio.to_thread(
+            lambda: service.events()
             .list(
                 calendarId="primary",
                 timeMin=now,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy="startTime",
+                fields=_LIST_FIELDS,
             )
             .execute()
         )
@@ -41,9 +90,9 @@ def create_event_tool(service):
             "end": {"dateTime": end_iso},
         }
 
-        created = (
-            service.events()
-            .insert(calendarId="primary", body=event)
+        created = await asyncio.to_thread(
+            lambda: service.events()
+            .insert(calendarId="primary", body=event, fields=_CREATE_FIELDS)
             .execute()
         )
 
@@ -56,19 +105,107 @@ def create_event_tool(service):
         "name": "calendar_create_event",
         "description": "Create a Google Calendar event",
         "fn": create_event,
+        "timeout": None,
     }
 
 
 def delete_event_tool(service):
     async def delete_event(event_id: str):
-        service.events().delete(
-            calendarId="primary",
-            eventId=event_id,
-        ).execute()
+        await asyncio.to_thread(
+            lambda: service.events().delete(
+                calendarId="primary",
+                eventId=event_id,
+            ).execute()
+        )
         return {"deleted": True, "event_id": event_id}
 
     return {
         "name": "calendar_delete_event",
         "description": "Delete a Google Calendar event by ID",
         "fn": delete_event,
+        "timeout": None,
+    }
+
+
+def create_events_tool(service):
+    def insert_request(ev):
+        return service.events().insert(
+            calendarId="primary",
+            body={
+                "summary": ev["summary"],
+                "start": {"dateTime": ev["start_iso"]},
+                "end": {"dateTime": ev["end_iso"]},
+            },
+            fields=_CREATE_FIELDS,
+        )
+
+    async def create_events(events: list[dict]):
+        # Reject incomplete events up front so they can't abort the whole batch
+        invalid = {}
+        items = []
+        for i, ev in enumerate(events):
+            missing = [field for field in _EVENT_FIELDS if not ev.get(field)]
+            if missing:
+                invalid[str(i)] = f"Missing {', '.join(missing)}"
+            else:
+                items.append((str(i), ev))
+        batches = await asyncio.gather(
+            *(
+                asyncio.to_thread(_execute_batch, service, insert_request, chunk)
+                for chunk in _chunks(items)
+            )
+        )
+        results = {}
+        for batch in batches:
+            results.update(batch)
+
+        created = []
+        for i in range(len(events)):
+            error = invalid.get(str(i)) or _batch_error(results, str(i))
+            if error:
+                created.append({"created": False, "error": error})
+            else:
+                event = results[str(i)]
+                created.append({"id": event["id"], "htmlLink": event["htmlLink"]})
+        return created
+
+    return {
+        "name": "calendar_create_events",
+        "description": "Create several Google Calendar events (each with summary, start_iso, end_iso) in one batched request",
+        "fn": create_events,
+        "timeout": None,
+    }
+
+
+def delete_events_tool(service):
+    def delete_request(event_id):
+        return service.events().delete(calendarId="primary", eventId=event_id)
+
+    async def delete_events(event_ids: list[str]):
+        event_ids = list(dict.fromkeys(event_ids))
+        items = [(event_id, event_id) for event_id in event_ids]
+        batches = await asyncio.gather(
+            *(
+                asyncio.to_thread(_execute_batch, service, delete_request, chunk)
+                for chunk in _chunks(items)
+            )
+        )
+        results = {}
+        for batch in batches:
+            results.update(batch)
+
+        deleted = []
+        for event_id in event_ids:
+            error = _batch_error(results, event_id)
+            if error:
+                deleted.append({"deleted": False, "event_id": event_id, "error": error})
+            else:
+                deleted.append({"deleted": True, "event_id": event_id})
+        return deleted
+
+    return {
+        "name": "calendar_delete_events",
+        "description": "Delete several Google Calendar events by ID in one batched request",
+        "fn": delete_events,
+        "timeout": None,
     }
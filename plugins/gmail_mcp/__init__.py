@@ -1,5 +1,10 @@
-from .client import get_google_service
-from .tools import list_messages_tool, get_message_tool, send_message_tool
+from .tools import (
+    list_messages_tool,
+    get_message_tool,
+    get_messages_tool,
+    list_and_fetch_tool,
+    send_message_tool,
+)
 
 def register(api):
     cfg = api.plugin_config
@@ -9,13 +14,19 @@ def register(api):
         # Plugin enabled but not configured; don't register tools.
         return
 
-    service = get_google_service(
+    from .client import LazyService, get_google_service, read_timeout
+
+    service = LazyService(lambda: get_google_service(
         api_name="gmail",
         api_version="v1",
         credentials_path=credentials_path,
-        token_path=cfg.get("token_path", "token.json")
-    )
+        token_path=cfg.get("token_path", "token.json"),
+    ))
+    # Read tools run uncapped until the first call has finished OAuth
+    timeout = read_timeout(service)
 
-    api.register_tool(list_messages_tool(service))
-    api.register_tool(get_message_tool(service))
+    api.register_tool({**list_messages_tool(service), "timeout": timeout})
+    api.register_tool({**get_message_tool(service), "timeout": timeout})
+    api.register_tool({**get_messages_tool(service), "timeout": timeout})
+    api.register_tool({**list_and_fetch_tool(service), "timeout": timeout})
     api.register_tool(send_message_tool(service))
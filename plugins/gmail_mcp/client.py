@@ -1,33 +1,24 @@
 from pathlib import Path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+
+# LazyService and read_timeout are re-exported for register()
+from .._google import LazyService, read_timeout, get_google_service as _get_google_service
 
 SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
     "https://www.googleapis.com/auth/gmail.send",
 ]
 
-def get_google_service(api_name, api_version, credentials_path, token_path):
-    credentials_path = Path(credentials_path)
-    token_path = Path(token_path)
-
-    creds = None
+# Optional pre-shipped discovery documents, e.g. discovery/gmail.v1.json
+DISCOVERY_DIR = Path(__file__).resolve().parent / "discovery"
 
-    if token_path.exists():
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                credentials_path,
-                SCOPES
-            )
-            creds = flow.run_local_server(port=0)
-
-        token_path.write_text(creds.to_json())
+def get_google_service(api_name, api_version, credentials_path, token_path):
+    return _get_google_service(
+        api_name,
+        api_version,
+        credentials_path,
+        token_path,
+        scopes=SCOPES,
+        discovery_dir=DISCOVERY_DIR,
+    )
 
-    return build(api_name, api_version, credentials=creds)
@@ -1,33 +1,121 @@
+import asyncio
 import base64
-from email.mime.text import MIMEText
+import html
+import re
+
+# Markup removed when an HTML-only body is turned into text
+_HTML_HIDDEN = re.compile(r"<(script|style|head)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_BREAK = re.compile(r"<\s*(br|/p|/div|/li|/tr|/h[1-6])\b[^>]*>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def _html_to_text(markup):
+    """Rough plain-text rendering of an HTML body (tags dropped, entities decoded)."""
+    text = _HTML_HIDDEN.sub("", markup)
+    text = _HTML_BREAK.sub("\n", text)
+    text = html.unescape(_HTML_TAG.sub("", text))
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _decode_part(data):
+    return base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
+
 
 def _decode_body(payload):
-    """Extract plain text body from Gmail message payload."""
-    if payload.get("body", {}).get("data"):
-        return base64.urlsafe_b64decode(
-            payload["body"]["data"].encode("ASCII")
-        ).decode("utf-8", errors="replace")
-    for part in payload.get("parts", []):
-        if part.get("mimeType") == "text/plain" and part.get("body", {}).get("data"):
-            return base64.urlsafe_b64decode(
-                part["body"]["data"].encode("ASCII")
-            ).decode("utf-8", errors="replace")
+    """Extract plain text body from Gmail message payload.
+
+    Walks nested multipart trees (e.g. multipart/alternative inside
+    multipart/mixed) and prefers the first text/plain part, falling back to
+    the first text/html part converted to text. Attachments (parts with a
+    filename) are never used as the body.
+    """
+    html_data = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        data = (part.get("body") or {}).get("data")
+        if data and not part.get("filename"):
+            mime_type = part.get("mimeType", "")
+            if mime_type.startswith("text/plain"):
+                return _decode_part(data)
+            if html_data is None and mime_type.startswith("text/html"):
+                html_data = data
+        # Reversed so parts are visited in document order
+        stack.extend(reversed(part.get("parts", ())))
+    if html_data:
+        return _html_to_text(_decode_part(html_data))
     return ""
 
 
-def _get_header(headers, name):
-    for h in headers:
-        if h["name"].lower() == name.lower():
-            return h["value"]
-    return ""
+# Gmail accepts at most 100 calls per batch request
+_BATCH_LIMIT = 100
+
+# Partial-response masks: only request what the tools return. The payload is
+# requested whole: a mask can't follow parts to any depth, and the body may be
+# nested arbitrarily deep (e.g. a forwarded message/rfc822 in multipart/mixed).
+_LIST_FIELDS = "messages(id,threadId),nextPageToken"
+_MESSAGE_FIELDS = "id,threadId,snippet,payload"
+
+
+def _format_message(msg):
+    """Flatten a full-format Gmail message into the tool's result shape."""
+    payload = msg.get("payload", {})
+    # Header names are case-insensitive; the first occurrence wins
+    headers = {}
+    for h in payload.get("headers", []):
+        headers.setdefault(h["name"].lower(), h["value"])
+    body = _decode_body(payload)
+    return {
+        "id": msg["id"],
+        "threadId": msg.get("threadId"),
+        "snippet": msg.get("snippet"),
+        "subject": headers.get("subject", ""),
+        "from": headers.get("from", ""),
+        "to": headers.get("to", ""),
+        "date": headers.get("date", ""),
+        "body": body,
+    }
+
+
+def _raw_message(to, subject, body):
+    """Build a base64url RFC 822 text/plain message for the Gmail send API."""
+    if any(c in value for value in (to, subject) for c in "\r\n"):
+        raise ValueError("Recipient and subject must not contain line breaks")
+
+    if to.isascii() and subject.isascii():
+        # Common case: write the headers directly instead of going through email.*
+        message = (
+            f"To: {to}\r\n"
+            f"Subject: {subject}\r\n"
+            "MIME-Version: 1.0\r\n"
+            "Content-Type: text/plain; charset=utf-8\r\n"
+            "Content-Transfer-Encoding: 8bit\r\n"
+            "\r\n"
+        ).encode("ascii") + body.encode("utf-8")
+    else:
+        from email.message import EmailMessage
+
+        msg = EmailMessage()
+        msg["To"] = to
+        msg["Subject"] = subject
+        msg.set_content(body)
+        message = msg.as_bytes()
+
+    return base64.urlsafe_b64encode(message).decode("ASCII")
 
 
 def list_messages_tool(service):
     async def list_messages(max_results: int = 10, label_ids=None):
-        params = {"userId": "me", "maxResults": max_results}
+        params = {"userId": "me", "maxResults": max_results, "fields": _LIST_FIELDS}
         if label_ids:
             params["labelIds"] = label_ids
-        result = service.users().messages().list(**params).execute()
+        # execute() blocks on HTTP; keep it (and the request build, which
+        # picks the thread's HTTP client) off the event loop.
+        result = await asyncio.to_thread(
+            lambda: service.users().messages().list(**params).execute()
+        )
         messages = result.get("messages", [])
         return [
             {"id": m["id"], "threadId": m.get("threadId")}
@@ -43,25 +131,13 @@ def list_messages_tool(service):
 
 def get_message_tool(service):
     async def get_message(message_id: str):
-        msg = (
-            service.users()
+        msg = await asyncio.to_thread(
+            lambda: service.users()
             .messages()
-            .get(userId="me", id=message_id, format="full")
+            .get(userId="me", id=message_id, format="full", fields=_MESSAGE_FIELDS)
             .execute()
         )
-        payload = msg.get("payload", {})
-        headers = payload.get("headers", [])
-        body = _decode_body(payload)
-        return {
-            "id": msg["id"],
-            "threadId": msg.get("threadId"),
-            "snippet": msg.get("snippet"),
-            "subject": _get_header(headers, "Subject"),
-            "from": _get_header(headers, "From"),
-            "to": _get_header(headers, "To"),
-            "date": _get_header(headers, "Date"),
-            "body": body,
-        }
+        return _format_message(msg)
 
     return {
         "name": "gmail_get_message",
@@ -70,16 +146,87 @@ def get_message_tool(service):
     }
 
 
+def _fetch_batch(service, ids):
+    """Fetch full messages for ids in one batch request.
+
+    Returns {id: message} for successes and {id: exception} for failures.
+    """
+    results = {}
+
+    def on_response(request_id, response, exception):
+        results[request_id] = response if exception is None else exception
+
+    batch = service.new_batch_http_request(callback=on_response)
+    for message_id in ids:
+        batch.add(
+            service.users().messages().get(
+                userId="me", id=message_id, format="full", fields=_MESSAGE_FIELDS
+            ),
+            request_id=message_id,
+        )
+    batch.execute()
+    return results
+
+
+async def _fetch_messages(service, ids):
+    """Fetch and format messages, one concurrent batch per _BATCH_LIMIT ids."""
+    ids = list(dict.fromkeys(ids))
+    chunks = [ids[i:i + _BATCH_LIMIT] for i in range(0, len(ids), _BATCH_LIMIT)]
+    batches = await asyncio.gather(
+        *(asyncio.to_thread(_fetch_batch, service, chunk) for chunk in chunks)
+    )
+    results = {}
+    for batch in batches:
+        results.update(batch)
+
+    messages = []
+    for message_id in ids:
+        result = results.get(message_id)
+        if isinstance(result, dict):
+            messages.append(_format_message(result))
+        else:
+            # Report per-id failures instead of dropping them
+            error = str(result) if result is not None else "No response for this message"
+            messages.append({"id": message_id, "fetched": False, "error": error})
+    return messages
+
+
+def get_messages_tool(service):
+    async def get_messages(ids: list[str]):
+        return await _fetch_messages(service, ids)
+
+    return {
+        "name": "gmail_get_messages",
+        "description": "Get several Gmail messages by ID in one batched request",
+        "fn": get_messages,
+    }
+
+
+def list_and_fetch_tool(service):
+    async def list_and_fetch(max_results: int = 10, label_ids=None):
+        params = {"userId": "me", "maxResults": max_results, "fields": _LIST_FIELDS}
+        if label_ids:
+            params["labelIds"] = label_ids
+        result = await asyncio.to_thread(
+            lambda: service.users().messages().list(**params).execute()
+        )
+        ids = [m["id"] for m in result.get("messages", [])]
+        return await _fetch_messages(service, ids)
+
+    return {
+        "name": "gmail_list_and_fetch",
+        "description": "List the most recent Gmail messages and return their full content in one call",
+        "fn": list_and_fetch,
+    }
+
+
 def send_message_tool(service):
     async def send_message(to: str, subject: str, body: str):
-        message = MIMEText(body)
-        message["to"] = to
-        message["subject"] = subject
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode("ASCII")
-        sent = (
-            service.users()
+        raw = _raw_message(to, subject, body)
+        sent = await asyncio.to_thread(
+            lambda: service.users()
             .messages()
-            .send(userId="me", body={"raw": raw})
+            .send(userId="me", body={"raw": raw}, fields="id,threadId")
             .execute()
         )
         return {"id": sent["id"], "threadId": sent.get("threadId")}
@@ -88,4 +235,5 @@ def send_message_tool(service):
         "name": "gmail_send_message",
         "description": "Send a Gmail message",
         "fn": send_message,
+        "timeout": None,
     }
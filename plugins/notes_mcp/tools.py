@@ -1,29 +1,14 @@
-import asyncio
-import subprocess
-
-def _run_applescript(script: str) -> str:
-    result = subprocess.run(
-        ["osascript", "-e", script],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr or result.stdout or "AppleScript failed")
-    return (result.stdout or "").strip()
-
-
-def _escape(s: str) -> str:
-    return s.replace("\\", "\\\\").replace('"', '\\"')
+from .._osascript import (
+    escape as _escape,
+    names_script,
+    run as _run_script,
+)
 
 
 def list_folders_tool():
     async def list_folders():
-        script = 'tell application "Notes" to get name of every folder of account 1'
-        out = await asyncio.to_thread(_run_applescript, script)
-        if not out:
-            return []
-        return [n.strip() for n in out.split(", ")]
+        out = await _run_script(names_script("Notes", "name of every folder of account 1"))
+        return out.splitlines()
 
     return {
         "name": "notes_list_folders",
@@ -35,11 +20,9 @@ def list_folders_tool():
 def list_notes_tool():
     async def list_notes(folder_name: str):
         escaped = _escape(folder_name)
-        script = f'tell application "Notes" to get name of every note of folder "{escaped}" of account 1'
-        out = await asyncio.to_thread(_run_applescript, script)
-        if not out:
-            return []
-        return [n.strip() for n in out.split(", ")]
+        script = names_script("Notes", f'name of every note of folder "{escaped}" of account 1')
+        out = await _run_script(script)
+        return out.splitlines()
 
     return {
         "name": "notes_list_notes",
@@ -57,11 +40,12 @@ def create_note_tool():
             f'tell application "Notes" to make new note at folder "{escaped_folder}" of account 1 '
             f'with properties {{name:"{escaped_title}", body:"{escaped_body}"}}'
         )
-        await asyncio.to_thread(_run_applescript, script)
+        await _run_script(script)
         return {"created": True, "folder": folder_name, "title": title}
 
     return {
         "name": "notes_create_note",
         "description": "Create a new note in an Apple Notes folder",
         "fn": create_note,
+        "timeout": None,
     }
@@ -1,29 +1,38 @@
-import asyncio
-import subprocess
+import threading
 
-def _run_applescript(script: str) -> str:
-    result = subprocess.run(
-        ["osascript", "-e", script],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr or result.stdout or "AppleScript failed")
-    return (result.stdout or "").strip()
+from .._osascript import (
+    escape as _escape,
+    names_script,
+    run as _run_script,
+    run_applescript as _run_applescript,
+    run_in_pool,
+)
 
+# One lock per list name: the create script makes a missing list, so two
+# concurrent creates into the same new list would otherwise both make it
+_LIST_LOCKS: dict[str, threading.Lock] = {}
+_LIST_LOCKS_GUARD = threading.Lock()
 
-def _escape(s: str) -> str:
-    return s.replace("\\", "\\\\").replace('"', '\\"')
+
+def _list_lock(list_name: str) -> threading.Lock:
+    # AppleScript compares list names case-insensitively
+    key = list_name.casefold()
+    with _LIST_LOCKS_GUARD:
+        lock = _LIST_LOCKS.get(key)
+        if lock is None:
+            lock = _LIST_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _run_in_list(list_name: str, script: str) -> str:
+    with _list_lock(list_name):
+        return _run_applescript(script)
 
 
 def list_lists_tool():
     async def list_lists():
-        script = 'tell application "Reminders" to get name of every list'
-        out = await asyncio.to_thread(_run_applescript, script)
-        if not out:
-            return []
-        return [n.strip() for n in out.split(", ")]
+        out = await _run_script(names_script("Reminders", "name of every list"))
+        return out.splitlines()
 
     return {
         "name": "reminders_list_lists",
@@ -35,11 +44,9 @@ def list_lists_tool():
 def list_reminders_tool():
     async def list_reminders(list_name: str):
         escaped = _escape(list_name)
-        script = f'tell application "Reminders" to get name of every reminder in list "{escaped}"'
-        out = await asyncio.to_thread(_run_applescript, script)
-        if not out:
-            return []
-        return [n.strip() for n in out.split(", ")]
+        script = names_script("Reminders", f'name of every reminder in list "{escaped}"')
+        out = await _run_script(script)
+        return out.splitlines()
 
     return {
         "name": "reminders_list_reminders",
@@ -48,18 +55,6 @@ def list_reminders_tool():
     }
 
 
-def _ensure_list(list_name: str) -> None:
-    """Create the list if it doesn't exist."""
-    lists_script = 'tell application "Reminders" to get name of every list'
-    out = _run_applescript(lists_script)
-    existing = [n.strip() for n in out.split(", ")] if out else []
-    if list_name in existing:
-        return
-    escaped = _escape(list_name)
-    create_script = f'tell application "Reminders" to make new list with properties {{name:"{escaped}"}}'
-    _run_applescript(create_script)
-
-
 def create_reminder_tool():
     async def create_reminder(
         list_name: str,
@@ -67,7 +62,6 @@ def create_reminder_tool():
         body: str = "",
         due_date_iso: str | None = None,
     ):
-        await asyncio.to_thread(_ensure_list, list_name)
         escaped_list = _escape(list_name)
         escaped_name = _escape(name)
         escaped_body = _escape(body) if body else ""
@@ -85,15 +79,21 @@ def create_reminder_tool():
             except ValueError:
                 pass
         props_str = ", ".join(props)
+        # Create the list if needed and add the reminder in one round-trip
         script = (
-            f'tell application "Reminders" to make new reminder at end of list "{escaped_list}" '
-            f'with properties {{{props_str}}}'
+            f'tell application "Reminders"\n'
+            f'  if not (exists list "{escaped_list}") then\n'
+            f'    make new list with properties {{name:"{escaped_list}"}}\n'
+            f'  end if\n'
+            f'  make new reminder at end of list "{escaped_list}" with properties {{{props_str}}}\n'
+            f'end tell'
         )
-        await asyncio.to_thread(_run_applescript, script)
+        await run_in_pool(_run_in_list, list_name, script)
         return {"created": True, "list": list_name, "name": name}
 
     return {
         "name": "reminders_create_reminder",
         "description": "Create a new reminder in an Apple Reminders list (optional due_date_iso)",
         "fn": create_reminder,
+        "timeout": None,
     }
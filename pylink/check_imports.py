@@ -4,11 +4,21 @@
   python3 check_imports.py
   # or from repo root:
   PYTHONPATH=pylink python3 pylink/check_imports.py
+  # names only, without importing anything (fast, no dependencies needed):
+  python3 check_imports.py --static
 
 Catches import/name mismatches (e.g. PixelLinkRuntime vs MaesRuntime) early.
+By default every module is really imported, so broken imports inside it are
+caught; if an import fails, names are also read from the module's source with
+ast. With --static, only the source is read: nothing is imported, so heavy
+dependencies (torch, mediapipe, browser_use) are never loaded.
 """
 from __future__ import annotations
 
+import argparse
+import ast
+import importlib
+import importlib.machinery
 import sys
 from pathlib import Path
 
@@ -32,16 +42,98 @@ _IMPORT_CHECKS = [
 ]
 
 
-def main() -> int:
+def _module_source(mod_name: str) -> str | None:
+    """Locate a module's source file without executing it or its parent packages."""
+    spec = None
+    search_path = None
+    parts = mod_name.split(".")
+    for i in range(len(parts)):
+        spec = importlib.machinery.PathFinder.find_spec(".".join(parts[: i + 1]), search_path)
+        if spec is None:
+            return None
+        search_path = spec.submodule_search_locations
+    return spec.origin if spec is not None else None
+
+
+def _collect_names(body: list[ast.stmt], names: set[str]) -> None:
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                for sub in ast.walk(target):
+                    if isinstance(sub, ast.Name):
+                        names.add(sub.id)
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.If):
+            _collect_names(node.body, names)
+            _collect_names(node.orelse, names)
+        elif isinstance(node, ast.Try):
+            _collect_names(node.body, names)
+            for handler in node.handlers:
+                _collect_names(handler.body, names)
+            _collect_names(node.orelse, names)
+            _collect_names(node.finalbody, names)
+
+
+def _static_exports(mod_name: str) -> set[str] | None:
+    """Top-level names bound by a module, read from its AST (no imports run)."""
+    origin = _module_source(mod_name)
+    if origin is None or not origin.endswith(".py"):
+        return None
+    with open(origin, "rb") as f:
+        tree = ast.parse(f.read(), filename=origin)
+    names: set[str] = set()
+    _collect_names(tree.body, names)
+    return names
+
+
+def _missing_static(mod_name: str, attrs: list[str]) -> list[str]:
+    try:
+        exports = _static_exports(mod_name)
+    except (OSError, SyntaxError) as e:
+        return [f"{mod_name}: {e}"]
+    if exports is None:
+        return [f"{mod_name}: source not found"]
+    return [
+        f"{mod_name}: missing attribute {attr!r}"
+        for attr in attrs
+        if attr not in exports
+    ]
+
+
+def _check_module(mod_name: str, attrs: list[str], static: bool = False) -> list[str]:
+    if static:
+        return _missing_static(mod_name, attrs)
+    try:
+        mod = importlib.import_module(mod_name)
+    except Exception as e:
+        # The import itself is the check; the source scan only adds detail
+        detail = [msg for msg in _missing_static(mod_name, attrs) if "missing attribute" in msg]
+        return [f"{mod_name}: {e}", *detail]
+    return [
+        f"{mod_name}: missing attribute {attr!r}"
+        for attr in attrs
+        if not hasattr(mod, attr)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate that all critical imports resolve.")
+    parser.add_argument(
+        "--static",
+        action="store_true",
+        help="check names from source only; don't import the modules",
+    )
+    args = parser.parse_args(argv)
+
     errors: list[str] = []
     for mod_name, attrs in _IMPORT_CHECKS:
-        try:
-            mod = __import__(mod_name, fromlist=attrs)
-            for attr in attrs:
-                if not hasattr(mod, attr):
-                    errors.append(f"{mod_name}: missing attribute {attr!r}")
-        except Exception as e:
-            errors.append(f"{mod_name}: {e}")
+        errors.extend(_check_module(mod_name, attrs, static=args.static))
 
     if errors:
         for msg in errors:
@@ -8,14 +8,16 @@ Uses the official browser-use API: https://github.com/browser-use/browser-use
 from __future__ import annotations
 
 import asyncio
+import atexit
+import functools
+import importlib
 import logging
 import os
+import random
+import re
+import threading
 from typing import Any, Optional, Callable
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
 logger = logging.getLogger(__name__)
 
 # Errors that are worth retrying (transient browser/CDP failures)
@@ -26,17 +28,107 @@ _RETRYABLE_PATTERNS = [
     "Connection refused",
     "Connection closed",
     "Timeout",
-    "timeout",
     "Target closed",
     "Session closed",
     "net::ERR_",
 ]
+_RETRYABLE_RE = re.compile("|".join(map(re.escape, _RETRYABLE_PATTERNS)), re.IGNORECASE)
+
+# Retry backoff: base * 2**(attempt-1), stretched by up to 50% jitter, capped
+_BACKOFF_BASE = 1.0
+_BACKOFF_JITTER = 0.5
+_BACKOFF_MAX = 30.0
+
+
+@functools.cache
+def _load_env() -> None:
+    """Load .env once, on first use rather than at import."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.cache
+def _browser_use():
+    """Import browser_use once and return it.
+
+    Not imported at module scope: the orchestrator imports this module at
+    startup and browser_use takes seconds to load.
+    """
+    try:
+        return importlib.import_module("browser_use")
+    except ImportError as e:
+        logger.error("Failed to import browser-use dependencies: %s", e)
+        raise ImportError(
+            "browser-use not installed. Run:\n"
+            "  pip install browser-use\n"
+            "  uvx browser-use install"
+        ) from e
+
+
+# Local browsers shared between agents, keyed by (event loop, headless): a
+# browser is bound to the loop it started on. Each agent drives its own tabs,
+# so one Chromium serves all agents on a loop.
+_shared_browsers: dict[tuple[asyncio.AbstractEventLoop, bool], Any] = {}
+# id(browser) -> [browser, refcount]. A discarded browser stays here until its
+# last user releases it.
+_browser_refs: dict[int, list] = {}
+_shared_browsers_lock = threading.Lock()
+
+
+def _acquire_shared_browser(headless: bool, factory: Callable[[], Any]) -> Any:
+    """Return the running loop's shared local browser, creating it if needed."""
+    key = (asyncio.get_running_loop(), headless)
+    with _shared_browsers_lock:
+        browser = _shared_browsers.get(key)
+        if browser is None:
+            browser = _shared_browsers[key] = factory()
+            _browser_refs[id(browser)] = [browser, 0]
+        _browser_refs[id(browser)][1] += 1
+        return browser
+
+
+async def _release_shared_browser(browser: Any, discard: bool = False) -> None:
+    """Drop one reference to browser, closing it once no agent holds it.
+
+    Args:
+        browser: Browser previously returned by _acquire_shared_browser, or
+            an unshared (cloud) browser, which is closed right away.
+        discard: Stop handing it to new agents (e.g. it crashed). Agents
+            still using it keep it until they release it too.
+    """
+    with _shared_browsers_lock:
+        if discard:
+            for key, shared in list(_shared_browsers.items()):
+                if shared is browser:
+                    del _shared_browsers[key]
+        entry = _browser_refs.get(id(browser))
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del _browser_refs[id(browser)]
+            for key, shared in list(_shared_browsers.items()):
+                if shared is browser:
+                    del _shared_browsers[key]
+    await _close_browser(browser)
+
+
+async def _close_browser(browser: Any) -> None:
+    # Sessions are kept alive (see _ensure_initialized), which makes stop()
+    # and close() no-ops in newer browser-use; kill() really shuts them down.
+    # Older versions only have close, or close on .session.
+    if hasattr(browser, 'kill'):
+        await browser.kill()
+    elif hasattr(browser, 'close'):
+        await browser.close()
+    elif hasattr(browser, 'session') and hasattr(browser.session, 'close'):
+        await browser.session.close()
 
 
 def _is_retryable_error(error: Exception) -> bool:
     """Check if an error is transient and worth retrying."""
-    msg = str(error)
-    return any(pattern in msg for pattern in _RETRYABLE_PATTERNS)
+    return _RETRYABLE_RE.search(str(error)) is not None
 
 
 class BrowserAgent:
@@ -61,6 +153,7 @@ class BrowserAgent:
             use_openai_fallback: If True, use OpenAI instead of ChatBrowserUse.
         """
         # Check for required API keys
+        _load_env()
         self.browser_use_api_key = os.getenv("BROWSER_USE_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
 
@@ -72,6 +165,8 @@ class BrowserAgent:
         self._browser = None
         self._llm = None
         self._initialized = False
+        # Loop that run_sync drives; the browser is bound to the loop it started on
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
 
         logger.info("BrowserAgent created (use_cloud=%s, headless=%s)", use_cloud, headless)
 
@@ -88,12 +183,12 @@ class BrowserAgent:
 
         self._emit_status("Initializing browser automation...")
 
-        try:
-            from browser_use import Agent, Browser, ChatBrowserUse
+        browser_use = _browser_use()
 
+        try:
             # Initialize LLM - prefer ChatBrowserUse, fallback to OpenAI
             if not self.use_openai_fallback and self.browser_use_api_key:
-                self._llm = ChatBrowserUse()
+                self._llm = browser_use.ChatBrowserUse()
                 logger.info("Using ChatBrowserUse LLM")
             elif self.openai_api_key:
                 # Fallback to OpenAI if no browser-use API key
@@ -114,34 +209,42 @@ class BrowserAgent:
                     "No API key found. Set BROWSER_USE_API_KEY or OPENAI_API_KEY in .env file."
                 )
 
-            # Configure browser
-            self._browser = Browser(
-                use_cloud=self.use_cloud,
-                headless=self.headless if not self.use_cloud else None,
-            )
+            # Configure browser; local agents share one Chromium per headless mode.
+            # keep_alive stops each task's Agent from closing the session when
+            # it finishes, so the next task reuses it; close() shuts it down.
+            if self.use_cloud:
+                self._browser = browser_use.Browser(use_cloud=True, headless=None, keep_alive=True)
+            else:
+                self._browser = _acquire_shared_browser(
+                    self.headless,
+                    lambda: browser_use.Browser(use_cloud=False, headless=self.headless, keep_alive=True),
+                )
 
             self._initialized = True
             self._emit_status("Browser automation ready")
             logger.info("BrowserAgent initialized successfully")
 
-        except ImportError as e:
-            logger.error("Failed to import browser-use dependencies: %s", e)
-            raise ImportError(
-                "browser-use not installed. Run:\n"
-                "  pip install browser-use\n"
-                "  uvx browser-use install"
-            ) from e
         except Exception as e:
             logger.error("Failed to initialize BrowserAgent: %s", e)
             raise
 
+    async def warm_up(self) -> None:
+        """Initialize browser-use ahead of the first task.
+
+        The browser_use import alone takes seconds, so it runs on a worker
+        thread rather than blocking the event loop.
+        """
+        await asyncio.to_thread(_browser_use)
+        await self._ensure_initialized()
+
     async def _try_recover_browser(self) -> None:
         """Attempt to recover browser state after a transient failure."""
         try:
             # Try lightweight reset: just mark as needing re-init
             if self._browser:
+                # Stop handing the broken browser to other agents as well
                 try:
-                    await self._browser.close()
+                    await _release_shared_browser(self._browser, discard=True)
                 except Exception:
                     pass
             self._browser = None
@@ -154,10 +257,22 @@ class BrowserAgent:
             self._browser = None
             self._initialized = False
 
+    def _agent_for(self, task: str):
+        """Build a browser-use Agent for one task.
+
+        Each task gets its own Agent (and so its own history), running on the
+        kept-alive browser session shared by earlier tasks.
+        """
+        return _browser_use().Agent(
+            task=task,
+            llm=self._llm,
+            browser=self._browser,
+        )
+
     async def run_task(self, task: str, max_steps: int = 25) -> dict[str, Any]:
         """Execute a browser automation task with retry logic.
 
-        Retries up to 3 times with exponential backoff (1s, 2s, 4s) for
+        Retries up to 3 times with jittered exponential backoff (~1s, ~2s) for
         transient errors like DOM watchdog crashes and CDP connection issues.
 
         Args:
@@ -168,7 +283,6 @@ class BrowserAgent:
             Dictionary with task result including success status and message.
         """
         max_retries = 3
-        backoff_seconds = [1, 2, 4]
         last_error: Optional[Exception] = None
 
         for attempt in range(1, max_retries + 1):
@@ -176,21 +290,15 @@ class BrowserAgent:
             self._emit_status(f"Starting browser task (attempt {attempt}/{max_retries}): {task[:50]}...")
 
             try:
-                from browser_use import Agent
-
-                agent = Agent(
-                    task=task,
-                    llm=self._llm,
-                    browser=self._browser,
-                )
-
+                agent = self._agent_for(task)
                 history = await agent.run(max_steps=max_steps)
 
                 self._emit_status("Browser task completed")
 
-                result_text = "Task executed successfully"
-                if history:
-                    result_text = str(history)
+                # Only this task's answer, not the whole step history
+                result_text = history.final_result() if history else None
+                if not result_text:
+                    result_text = "Task executed successfully"
 
                 return {
                     "success": True,
@@ -201,12 +309,16 @@ class BrowserAgent:
             except Exception as e:
                 last_error = e
                 if _is_retryable_error(e) and attempt < max_retries:
-                    wait = backoff_seconds[attempt - 1]
+                    # Jitter keeps agents that failed together from retrying in lockstep
+                    wait = min(
+                        _BACKOFF_MAX,
+                        _BACKOFF_BASE * 2 ** (attempt - 1) * (1 + random.random() * _BACKOFF_JITTER),
+                    )
                     logger.warning(
-                        "BrowserAgent: retryable error on attempt %d/%d, waiting %ds: %s",
+                        "BrowserAgent: retryable error on attempt %d/%d, waiting %.2fs: %s",
                         attempt, max_retries, wait, e,
                     )
-                    self._emit_status(f"Browser error (attempt {attempt}/{max_retries}), retrying in {wait}s...")
+                    self._emit_status(f"Browser error (attempt {attempt}/{max_retries}), retrying in {wait:.1f}s...")
                     await asyncio.sleep(wait)
                     await self._try_recover_browser()
                     continue
@@ -345,15 +457,10 @@ class BrowserAgent:
         return await self.run_task(instruction)
 
     async def close(self) -> None:
-        """Close the browser and cleanup resources."""
+        """Release the browser, closing it once no other agent shares it."""
         if self._browser:
             try:
-                # browser-use Browser may not have a close method on BrowserSession
-                # Try different close patterns
-                if hasattr(self._browser, 'close'):
-                    await self._browser.close()
-                elif hasattr(self._browser, 'session') and hasattr(self._browser.session, 'close'):
-                    await self._browser.session.close()
+                await _release_shared_browser(self._browser)
                 self._emit_status("Browser closed")
             except Exception as e:
                 logger.warning("Error closing browser: %s", e)
@@ -361,21 +468,63 @@ class BrowserAgent:
                 self._browser = None
                 self._initialized = False
 
+    async def __aenter__(self) -> "BrowserAgent":
+        await self._ensure_initialized()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __del__(self) -> None:
+        # close() is async and can't run safely from a finalizer; just flag the leak
+        if getattr(self, "_initialized", False) and getattr(self, "_browser", None) is not None:
+            logger.warning("BrowserAgent garbage-collected without close(); browser may still be running")
+
     def run_sync(self, task: str, max_steps: int = 25) -> dict[str, Any]:
         """Synchronous wrapper for run_task.
 
+        Every call runs on the same event loop, kept open between calls (until
+        close_sync or interpreter exit), so the browser started by the first
+        task stays usable for the next.
+
         Args:
             task: Natural language task description.
             max_steps: Maximum steps.
 
         Returns:
             Result dictionary.
+
+        Raises:
+            RuntimeError: If called while an event loop is running.
         """
-        return asyncio.run(self.run_task(task, max_steps))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("run_sync called from a running event loop; use await run_task instead")
+
+        if self._sync_loop is None or self._sync_loop.is_closed():
+            self._sync_loop = asyncio.new_event_loop()
+            # Release the browser and close the loop at exit if close_sync isn't called
+            atexit.register(self.close_sync)
+        return self._sync_loop.run_until_complete(self.run_task(task, max_steps))
+
+    def close_sync(self) -> None:
+        """Release the browser used by run_sync and close its event loop."""
+        atexit.unregister(self.close_sync)
+        loop, self._sync_loop = self._sync_loop, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.run_until_complete(self.close())
+        finally:
+            loop.close()
 
 
-# Global instance
-_browser_agent: Optional[BrowserAgent] = None
+# Shared agents, one per (use_cloud, headless) configuration
+_browser_agents: dict[tuple[bool, bool], BrowserAgent] = {}
+_browser_agents_lock = threading.Lock()
 
 
 def get_browser_agent(
@@ -383,29 +532,36 @@ def get_browser_agent(
     headless: bool = False,
     on_status_update: Optional[Callable[[str], None]] = None,
 ) -> BrowserAgent:
-    """Get or create the global browser agent instance.
+    """Get or create the shared browser agent for a configuration.
+
+    Agents are keyed by (use_cloud, headless), so a caller never gets an
+    instance built with different settings. Creation is locked so concurrent
+    callers don't each launch a browser.
 
     Args:
         use_cloud: Whether to use Browser Use Cloud (stealth browser).
         headless: Whether to run in headless mode.
-        on_status_update: Optional status callback.
+        on_status_update: Optional status callback. Replaces the callback
+            of the previous caller.
 
     Returns:
         BrowserAgent instance.
     """
-    global _browser_agent
-    if _browser_agent is None:
-        _browser_agent = BrowserAgent(
-            use_cloud=use_cloud,
-            headless=headless,
-            on_status_update=on_status_update,
-        )
-    return _browser_agent
+    key = (use_cloud, headless)
+    agent = _browser_agents.get(key)
+    if agent is None:
+        with _browser_agents_lock:
+            agent = _browser_agents.get(key)
+            if agent is None:
+                agent = _browser_agents[key] = BrowserAgent(use_cloud=use_cloud, headless=headless)
+    agent.on_status_update = on_status_update
+    return agent
 
 
 async def close_browser_agent() -> None:
-    """Close the global browser agent if it exists."""
-    global _browser_agent
-    if _browser_agent:
-        await _browser_agent.close()
-        _browser_agent = None
+    """Close all shared browser agents."""
+    with _browser_agents_lock:
+        agents = list(_browser_agents.values())
+        _browser_agents.clear()
+    for agent in agents:
+        await agent.close()
@@ -1,8 +1,10 @@
 """Browsing history tracking for PixelLink."""
 
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from itertools import islice
+from typing import Deque, List, Optional, Tuple
 from urllib.parse import urlparse
 
 
@@ -13,15 +15,18 @@ class BrowsingEntry:
     timestamp: datetime
     title: str = ""
     search_query: str = ""  # If it was a search
+    domain: str = field(init=False, default="")
+    # URL, title and query lowercased and joined, for search_history
+    _search_text: str = field(init=False, default="", repr=False, compare=False)
     
-    @property
-    def domain(self) -> str:
-        """Extract domain from URL."""
+    def __post_init__(self) -> None:
+        # Parsed once here; get_domains reads it for every entry
         try:
-            parsed = urlparse(self.url)
-            return parsed.netloc
+            self.domain = urlparse(self.url).netloc
         except Exception:
-            return ""
+            self.domain = ""
+        # NUL-separated so a query can't match across two fields
+        self._search_text = "\0".join((self.url, self.title, self.search_query)).lower()
     
     @property
     def is_search(self) -> bool:
@@ -34,7 +39,11 @@ class BrowsingHistory:
     
     def __init__(self, max_entries: int = 1000):
         self.max_entries = max_entries
-        self.history: List[BrowsingEntry] = []
+        # Oldest entries fall off the left once max_entries is reached
+        self.history: Deque[BrowsingEntry] = deque(maxlen=max_entries)
+        # Bumped on every change; get_context_summary is cached against it
+        self._version = 0
+        self._summary: Optional[Tuple[int, str]] = None
     
     def add_url(self, url: str, title: str = "", search_query: str = "") -> None:
         """Add a URL to browsing history."""
@@ -45,49 +54,33 @@ class BrowsingHistory:
             search_query=search_query,
         )
         self.history.append(entry)
-        
-        # Keep history size manageable
-        if len(self.history) > self.max_entries:
-            self.history = self.history[-self.max_entries:]
+        self._version += 1
     
     def get_recent(self, count: int = 10) -> List[BrowsingEntry]:
         """Get most recent browsing entries."""
-        return list(reversed(self.history[-count:]))
+        return list(islice(reversed(self.history), count))
     
     def search_history(self, query: str, limit: int = 10) -> List[BrowsingEntry]:
         """Search browsing history for matching entries."""
         query_lower = query.lower()
-        matches = []
-        
-        for entry in reversed(self.history):
-            # Search in URL, title, and search query
-            if (query_lower in entry.url.lower() or
-                query_lower in entry.title.lower() or
-                query_lower in entry.search_query.lower()):
-                matches.append(entry)
-                if len(matches) >= limit:
-                    break
-        
-        return matches
+        # Search in URL, title, and search query
+        matches = (entry for entry in reversed(self.history) if query_lower in entry._search_text)
+        return list(islice(matches, limit))
     
     def get_domains(self, limit: int = 20) -> List[str]:
         """Get most frequently visited domains."""
-        domain_counts = {}
-        for entry in self.history:
-            domain = entry.domain
-            if domain:
-                domain_counts[domain] = domain_counts.get(domain, 0) + 1
-        
-        # Sort by frequency
-        sorted_domains = sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)
-        return [domain for domain, _ in sorted_domains[:limit]]
+        domain_counts = Counter(entry.domain for entry in self.history if entry.domain)
+        return [domain for domain, _ in domain_counts.most_common(limit)]
     
     def get_search_queries(self, limit: int = 20) -> List[str]:
         """Get recent search queries."""
+        seen = set()
         queries = []
         for entry in reversed(self.history):
-            if entry.is_search and entry.search_query not in queries:
-                queries.append(entry.search_query)
+            query = entry.search_query
+            if query and query not in seen:
+                seen.add(query)
+                queries.append(query)
                 if len(queries) >= limit:
                     break
         return queries
@@ -95,12 +88,21 @@ class BrowsingHistory:
     def clear(self) -> None:
         """Clear all browsing history."""
         self.history.clear()
+        self._version += 1
     
     def get_context_summary(self) -> str:
         """Get a text summary of browsing context for LLM."""
         if not self.history:
             return "No browsing history available."
         
+        version = self._version
+        if self._summary is not None and self._summary[0] == version:
+            return self._summary[1]
+        summary = self._build_context_summary()
+        self._summary = (version, summary)
+        return summary
+    
+    def _build_context_summary(self) -> str:
         recent = self.get_recent(5)
         domains = self.get_domains(5)
         queries = self.get_search_queries(5)
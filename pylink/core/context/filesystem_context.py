@@ -1,20 +1,79 @@
 """File system context manager for PixelLink."""
 
+import asyncio
+import bisect
+import heapq
+import operator
 import os
-from dataclasses import dataclass
+import queue
+import subprocess
+import sys
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
-from typing import List, Set, Optional
+from typing import Callable, Dict, List, Set, Optional, Tuple
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-@dataclass
+# Seconds to wait on Spotlight before falling back to the index
+_MDFIND_TIMEOUT = 1.5
+
+# Whether os.stat() accepts dir_fd here (not on Windows)
+_STAT_DIR_FD = os.stat in os.supports_dir_fd
+
+# Sort keys for indexed files
+_BY_MTIME = operator.attrgetter("mtime")
+_BY_NAME_LOWER = operator.attrgetter("_name_lower")
+
+# Recent search_files results kept per index, for repeated/typeahead queries
+_SEARCH_CACHE_SIZE = 128
+
+
+def _token_counter(tokens: List[str]) -> Callable[[str], int]:
+    """Return a function counting how many distinct tokens occur in a string.
+    
+    With pyahocorasick installed, each string is scanned once for all tokens
+    instead of once per token.
+    """
+    if ahocorasick is None:
+        return lambda text: sum(1 for token in tokens if token in text)
+    
+    automaton = ahocorasick.Automaton()
+    for token in tokens:
+        automaton.add_word(token, token)
+    automaton.make_automaton()
+    return lambda text: len({token for _, token in automaton.iter(text)})
+
+
+@dataclass(slots=True)
 class FileInfo:
-    """Information about a file."""
+    """Information about a file.
+    
+    Slotted, with the mtime kept as a float: the index holds up to
+    max_files of these and sorts them by mtime.
+    """
     path: str
     name: str
     size: int
-    modified: datetime
+    mtime: float
     extension: str = ""
+    # Lowercased once here instead of on every search_files comparison
+    _name_lower: str = field(init=False, repr=False, compare=False)
+    _path_lower: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._name_lower = self.name.lower()
+        self._path_lower = self.path.lower()
+    
+    @property
+    def modified(self) -> datetime:
+        """Last modification time."""
+        return datetime.fromtimestamp(self.mtime)
     
     @property
     def size_mb(self) -> float:
@@ -22,6 +81,15 @@ class FileInfo:
         return self.size / (1024 * 1024)
 
 
+@dataclass
+class _DirScan:
+    """One directory's scan, kept between index runs."""
+    mtime_ns: int
+    # (file, st_mtime_ns) for each indexable file directly in the directory
+    files: List[Tuple[FileInfo, int]]
+    subdirs: List[str]
+
+
 class FileSystemContext:
     """Manages file system context for queries."""
     
@@ -33,7 +101,7 @@ class FileSystemContext:
     ]
     
     # File extensions to index
-    INDEXABLE_EXTENSIONS = {
+    INDEXABLE_EXTENSIONS = frozenset({
         # Documents
         ".txt", ".md", ".pdf", ".doc", ".docx", ".rtf",
         # Code
@@ -45,14 +113,34 @@ class FileSystemContext:
         ".jpg", ".jpeg", ".png", ".gif", ".svg",
         # Other
         ".zip", ".tar", ".gz",
-    }
+    })
+    
+    # Directory names never descended into
+    EXCLUDED_DIRS = frozenset({
+        ".git", ".venv", "node_modules", "__pycache__", ".cache",
+        ".mypy_cache", ".pytest_cache", "dist", "build",
+    })
     
     def __init__(self, search_paths: Optional[List[str]] = None, max_files: int = 10000):
         self.search_paths = search_paths or self.DEFAULT_SEARCH_PATHS
         self.max_files = max_files
         self.indexed_files: List[FileInfo] = []
         self.last_indexed: Optional[datetime] = None
-        self._excluded_dirs = {".git", ".venv", "node_modules", "__pycache__", ".cache"}
+        # Lookup tables over indexed_files, rebuilt by index_files()
+        self._by_extension: Dict[str, List[FileInfo]] = {}
+        self._by_name_lower: Dict[str, FileInfo] = {}
+        self._extension_counts: Counter = Counter()
+        # (last_indexed it was built for, text) for get_context_summary
+        self._summary: Optional[Tuple[datetime, str]] = None
+        # Lowercased names in sorted order, with their files, for prefix search
+        self._sorted_names: List[str] = []
+        self._sorted_files: List[FileInfo] = []
+        # (query_lower, limit) -> results; replaced, not cleared, on re-index so
+        # a search still running against the old index can't repopulate it
+        self._search_cache: "OrderedDict[Tuple[str, int], List[FileInfo]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        # Last scan of each directory, so re-indexing reuses unchanged results
+        self._dir_scans: Dict[str, _DirScan] = {}
     
     def index_files(self, force: bool = False) -> int:
         """Index files in search paths. Returns number of files indexed."""
@@ -61,111 +149,401 @@ class FileSystemContext:
             return len(self.indexed_files)
         
         self.indexed_files.clear()
+        self._walk(self.indexed_files)
         
-        for search_path in self.search_paths:
-            expanded_path = os.path.expanduser(search_path)
-            if not os.path.exists(expanded_path):
-                continue
-            
-            try:
-                self._index_directory(expanded_path)
-            except Exception as e:
-                print(f"Warning: Could not index {expanded_path}: {e}")
-        
-        # Sort by modified time (most recent first)
-        self.indexed_files.sort(key=lambda f: f.modified, reverse=True)
-        
-        # Limit total files
+        # Most recently modified first, limited to max_files
         if len(self.indexed_files) > self.max_files:
-            self.indexed_files = self.indexed_files[:self.max_files]
+            self.indexed_files = heapq.nlargest(self.max_files, self.indexed_files, key=_BY_MTIME)
+        else:
+            self.indexed_files.sort(key=_BY_MTIME, reverse=True)
         
+        self._build_lookups()
+        self._search_cache = OrderedDict()
         self.last_indexed = datetime.now()
         return len(self.indexed_files)
     
-    def _index_directory(self, directory: str) -> None:
-        """Recursively index a directory."""
-        try:
-            for root, dirs, files in os.walk(directory):
-                # Remove excluded directories from traversal
-                dirs[:] = [d for d in dirs if d not in self._excluded_dirs]
+    def _build_lookups(self) -> None:
+        """Bucket indexed files by extension and by lowercased name.
+        
+        indexed_files is newest-first, so buckets are too, and a duplicate
+        name maps to its most recently modified file.
+        """
+        by_extension: Dict[str, List[FileInfo]] = {}
+        by_name_lower: Dict[str, FileInfo] = {}
+        for file_info in self.indexed_files:
+            by_extension.setdefault(file_info.extension, []).append(file_info)
+            by_name_lower.setdefault(file_info._name_lower, file_info)
+        self._by_extension = by_extension
+        self._by_name_lower = by_name_lower
+        self._extension_counts = Counter({ext: len(files) for ext, files in by_extension.items()})
+        
+        by_name = sorted(self.indexed_files, key=_BY_NAME_LOWER)
+        self._sorted_names = [f._name_lower for f in by_name]
+        self._sorted_files = by_name
+    
+    def _walk(self, files: List[FileInfo]) -> None:
+        """Walk all search paths, appending indexable files to files.
+        
+        Each directory is scanned as its own task on a thread pool; scandir
+        and stat release the GIL, so sibling directories are read in
+        parallel. Results are merged here, on the calling thread, so no
+        locking is needed. Stops scheduling once max_files are found.
+        """
+        roots = [os.path.expanduser(p) for p in self.search_paths]
+        roots = [r for r in roots if os.path.isdir(r)]
+        if not roots:
+            self._dir_scans = {}
+            return
+        
+        previous_scans = self._dir_scans
+        scans: Dict[str, _DirScan] = {}
+        results: "queue.SimpleQueue[Tuple[str, Optional[_DirScan]]]" = queue.SimpleQueue()
+        
+        def scan(directory: str) -> None:
+            # Always report back, or the loop below would wait forever
+            try:
+                result = self._index_directory(directory, previous_scans.get(directory))
+            except Exception as e:
+                print(f"Warning: Could not index {directory}: {e}")
+                result = None
+            results.put((directory, result))
+        
+        remaining = self.max_files - len(files)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for root in roots:
+                executor.submit(scan, root)
+            outstanding = len(roots)
+            while outstanding:
+                directory, dir_scan = results.get()
+                outstanding -= 1
+                if dir_scan is None:
+                    continue
+                scans[directory] = dir_scan
+                files.extend(file_info for file_info, _ in dir_scan.files)
+                remaining -= len(dir_scan.files)
+                
+                # Check if we've hit the limit
+                if remaining <= 0:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
                 
-                for filename in files:
-                    # Check if we've hit the limit
-                    if len(self.indexed_files) >= self.max_files:
-                        return
-                    
-                    file_path = os.path.join(root, filename)
-                    ext = os.path.splitext(filename)[1].lower()
-                    
-                    # Only index known extensions
-                    if ext not in self.INDEXABLE_EXTENSIONS:
+                for subdir in dir_scan.subdirs:
+                    executor.submit(scan, subdir)
+                outstanding += len(dir_scan.subdirs)
+        
+        self._dir_scans = scans
+    
+    def _index_directory(self, directory: str, previous: Optional[_DirScan]) -> Optional[_DirScan]:
+        """Scan one directory for indexable files and subdirectories to visit.
+        
+        If the directory's mtime matches its previous scan, no entries were
+        added, removed or renamed, so the listing is reused and only the known
+        files are re-stat()ed (in-place edits don't change the directory's
+        mtime). FileInfos whose file is unchanged are reused either way.
+        Returns None if the directory can't be read.
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            # Skip directories we can't access
+            return None
+        
+        known = {file_info.path: (file_info, old_mtime) for file_info, old_mtime in previous.files} if previous else {}
+        files: List[Tuple[FileInfo, int]] = []
+        
+        if previous is not None and previous.mtime_ns == mtime_ns:
+            # stat by name relative to the open directory, like scandir does,
+            # rather than resolving every full path from the root again
+            dir_fd = None
+            if _STAT_DIR_FD:
+                try:
+                    dir_fd = os.open(directory, os.O_RDONLY)
+                except OSError:
+                    pass
+            try:
+                for file_info, _ in previous.files:
+                    try:
+                        if dir_fd is not None:
+                            stat = os.stat(file_info.name, dir_fd=dir_fd)
+                        else:
+                            stat = os.stat(file_info.path)
+                    except OSError:
                         continue
-                    
+                    files.append(self._reuse_or_build(known, file_info.path, file_info.name, file_info.extension, stat))
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
+            return _DirScan(mtime_ns, files, previous.subdirs)
+        
+        subdirs: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
                     try:
-                        stat = os.stat(file_path)
-                        file_info = FileInfo(
-                            path=file_path,
-                            name=filename,
-                            size=stat.st_size,
-                            modified=datetime.fromtimestamp(stat.st_mtime),
-                            extension=ext,
-                        )
-                        self.indexed_files.append(file_info)
-                    except Exception:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Skip excluded directories
+                            if entry.name not in self.EXCLUDED_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            ext = self._indexable_extension(entry.name)
+                            if ext is None:
+                                continue
+                            # DirEntry caches the stat from the directory scan on most platforms
+                            try:
+                                stat = entry.stat()
+                            except (FileNotFoundError, PermissionError):
+                                # Removed since the scan, or not ours to read
+                                continue
+                            files.append(self._reuse_or_build(known, entry.path, entry.name, ext, stat))
+                    except OSError:
                         # Skip files we can't access
                         continue
-        except Exception:
-            # Skip directories we can't access
-            pass
+        except OSError:
+            return None
+        return _DirScan(mtime_ns, files, subdirs)
+    
+    def _reuse_or_build(
+        self,
+        known: Dict[str, Tuple[FileInfo, int]],
+        path: str,
+        name: str,
+        ext: str,
+        stat: os.stat_result,
+    ) -> Tuple[FileInfo, int]:
+        """Return the known FileInfo for path if the file is unchanged, else a new one."""
+        hit = known.get(path)
+        if hit is not None and hit[1] == stat.st_mtime_ns and hit[0].size == stat.st_size:
+            return hit
+        return self._file_info(path, name, ext, stat), stat.st_mtime_ns
+    
+    def _file_info(self, path: str, name: str, ext: str, stat: os.stat_result) -> FileInfo:
+        return FileInfo(
+            path=path,
+            name=name,
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            extension=ext,
+        )
+    
+    def _indexable_extension(self, name: str) -> Optional[str]:
+        """Return the lowercased extension of name, or None if it isn't indexed."""
+        # Same as os.path.splitext here: a leading dot (".bashrc") is not an extension
+        dot = name.rfind(".")
+        if dot <= 0:
+            return None
+        ext = name[dot:]
+        # Most extensions are already lowercase; don't allocate a copy for them
+        if not ext.islower():
+            ext = ext.lower()
+        
+        # Only index known extensions
+        if ext not in self.INDEXABLE_EXTENSIONS:
+            return None
+        return ext
+    
+    def _search_with_mdfind(self, query: str, limit: int) -> Optional[List[FileInfo]]:
+        """Search the search paths with Spotlight.
+        
+        All roots go to a single mdfind call (repeated -onlyin), so a query
+        costs one process spawn. Returns None if Spotlight isn't usable.
+        """
+        args = self._mdfind_args(query)
+        if args is None:
+            return None
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, timeout=_MDFIND_TIMEOUT)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+        return self._file_infos_from_paths(result.stdout.splitlines(), limit)
+    
+    async def _asearch_with_mdfind(self, query: str, limit: int) -> Optional[List[FileInfo]]:
+        """Async _search_with_mdfind: waits on Spotlight without blocking the loop."""
+        args = self._mdfind_args(query)
+        if args is None:
+            return None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=_MDFIND_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        if proc.returncode != 0:
+            return None
+        paths = stdout.decode("utf-8", errors="replace").splitlines()
+        # The hits are stat()ed one by one; keep that off the loop too
+        return await asyncio.to_thread(self._file_infos_from_paths, paths, limit)
+    
+    def _mdfind_args(self, query: str) -> Optional[List[str]]:
+        """mdfind command line covering all existing search paths, or None."""
+        if sys.platform != "darwin":
+            return None
+        roots = [os.path.expanduser(p) for p in self.search_paths]
+        roots = [r for r in roots if os.path.isdir(r)]
+        if not roots:
+            return None
+        
+        args = ["mdfind", "-name", query]
+        for root in roots:
+            args += ["-onlyin", root]
+        return args
+    
+    def _file_infos_from_paths(self, paths: List[str], limit: int) -> List[FileInfo]:
+        """Build FileInfos for indexable files among paths, up to limit."""
+        matches = []
+        for file_path in paths:
+            name = os.path.basename(file_path)
+            ext = self._indexable_extension(name)
+            if ext is None or self.EXCLUDED_DIRS.intersection(file_path.split(os.sep)):
+                continue
+            try:
+                stat = os.stat(file_path)
+            except (FileNotFoundError, PermissionError):
+                continue
+            matches.append(self._file_info(file_path, name, ext, stat))
+            if len(matches) >= limit:
+                break
+        return matches
     
     def search_files(self, query: str, limit: int = 20) -> List[FileInfo]:
-        """Search indexed files by name or path."""
+        """Search indexed files by name or path.
+        
+        Until the first index_files() finishes, searches go to Spotlight
+        (on macOS) so they don't come back empty.
+        """
+        if self.last_indexed is None:
+            matches = self._search_with_mdfind(query, limit)
+            if matches is not None:
+                return matches
+        return self._search_index(query, limit)
+    
+    async def asearch_files(self, query: str, limit: int = 20) -> List[FileInfo]:
+        """Async search_files, for callers running on an event loop."""
+        if self.last_indexed is None:
+            matches = await self._asearch_with_mdfind(query, limit)
+            if matches is not None:
+                return matches
+        return await asyncio.to_thread(self._search_index, query, limit)
+    
+    def _search_index(self, query: str, limit: int) -> List[FileInfo]:
+        """Match against indexed names and paths, memoized until the next re-index."""
         query_lower = query.lower()
-        matches = []
+        key = (query_lower, limit)
+        cache = self._search_cache
+        with self._search_cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                return list(cached)
         
+        matches = self._match_index(query_lower, limit)
+        with self._search_cache_lock:
+            cache[key] = matches
+            if len(cache) > _SEARCH_CACHE_SIZE:
+                cache.popitem(last=False)
+        return list(matches)
+    
+    def _match_index(self, query_lower: str, limit: int) -> List[FileInfo]:
+        """Uncached search behind _search_index.
+        
+        Files whose name starts with the query come first. They are found by
+        binary search over the sorted names, so when there are enough of
+        them the full substring scan is skipped. Each group is newest-first.
+        Multi-word queries are handled by _match_tokens.
+        """
+        tokens = list(dict.fromkeys(query_lower.split()))
+        if len(tokens) > 1:
+            return self._match_tokens(tokens, limit)
+        
+        lo = bisect.bisect_left(self._sorted_names, query_lower)
+        hi = bisect.bisect_left(self._sorted_names, query_lower + "\U0010ffff", lo)
+        prefixed = heapq.nlargest(limit, self._sorted_files[lo:hi], key=_BY_MTIME)
+        if len(prefixed) >= limit:
+            return prefixed
+        
+        matches = prefixed
+        seen = set(map(id, prefixed))
         for file_info in self.indexed_files:
-            if (query_lower in file_info.name.lower() or
-                query_lower in file_info.path.lower()):
+            if id(file_info) in seen:
+                continue
+            if (query_lower in file_info._name_lower or
+                query_lower in file_info._path_lower):
                 matches.append(file_info)
                 if len(matches) >= limit:
                     break
         
         return matches
     
+    def _match_tokens(self, tokens: List[str], limit: int) -> List[FileInfo]:
+        """Rank files by how many of tokens appear in their path (which ends in the name).
+        
+        Files containing every token come first, then those with the most
+        tokens; newest-first within each. Stops early once limit files
+        contain every token.
+        """
+        count_hits = _token_counter(tokens)
+        full: List[FileInfo] = []
+        partial: List[Tuple[int, FileInfo]] = []
+        for file_info in self.indexed_files:
+            hits = count_hits(file_info._path_lower)
+            if hits == len(tokens):
+                full.append(file_info)
+                if len(full) >= limit:
+                    return full
+            elif hits:
+                partial.append((hits, file_info))
+        
+        # sort is stable, so equal counts stay newest-first
+        partial.sort(key=lambda item: item[0], reverse=True)
+        return (full + [file_info for _, file_info in partial])[:limit]
+    
     def get_recent_files(self, limit: int = 20, extension: Optional[str] = None) -> List[FileInfo]:
         """Get recently modified files, optionally filtered by extension."""
         if extension:
-            filtered = [f for f in self.indexed_files if f.extension == extension]
-            return filtered[:limit]
+            return self.get_files_by_extension(extension, limit)
         return self.indexed_files[:limit]
     
     def get_files_by_extension(self, extension: str, limit: int = 20) -> List[FileInfo]:
         """Get files with specific extension."""
-        matches = [f for f in self.indexed_files if f.extension == extension]
-        return matches[:limit]
+        return self._by_extension.get(extension, [])[:limit]
     
     def find_exact_file(self, filename: str) -> Optional[FileInfo]:
         """Find a file by exact name match."""
-        for file_info in self.indexed_files:
-            if file_info.name.lower() == filename.lower():
-                return file_info
-        return None
+        return self._by_name_lower.get(filename.lower())
     
     def get_context_summary(self) -> str:
-        """Get a text summary of file system context for LLM."""
+        """Get a text summary of file system context for LLM.
+        
+        Built once per index run; keyed on last_indexed, which index_files
+        sets only after the new index is complete.
+        """
         if not self.indexed_files:
             return "No files indexed. Run index_files() first."
         
-        recent_files = self.get_recent_files(5)
+        indexed_at = self.last_indexed
+        cached = self._summary
+        if cached is not None and indexed_at is not None and cached[0] is indexed_at:
+            return cached[1]
         
-        # Count files by extension
-        ext_counts = {}
-        for file_info in self.indexed_files:
-            ext = file_info.extension
-            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+        summary = self._build_context_summary()
+        if indexed_at is not None:
+            self._summary = (indexed_at, summary)
+        return summary
+    
+    def _build_context_summary(self) -> str:
+        recent_files = self.get_recent_files(5)
         
-        # Get top extensions
-        top_exts = sorted(ext_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Top extensions by file count
+        top_exts = self._extension_counts.most_common(5)
         
         summary_parts = [
             f"Indexed {len(self.indexed_files)} files from {len(self.search_paths)} locations",
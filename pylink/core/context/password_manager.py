@@ -1,12 +1,72 @@
 """Password manager integration for PixelLink."""
 
+import functools
+import os
 import platform
+import select
 import subprocess
+import threading
+import time
 import json
 import re
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+# Keychain password output: password: "actual_password", or unquoted
+_PASSWORD_PATTERNS = (
+    re.compile(r'password:\s*"([^"]*)"'),
+    re.compile(r'password:\s*(\S+)'),
+)
+
+
+# How long a parsed `security dump-keychain` listing is trusted
+_KEYCHAIN_INDEX_TTL = 300.0
+
+# `find-*-password -g` may show a Keychain access prompt; give the user time
+# to answer it rather than timing out and prompting again
+_KEYCHAIN_PROMPT_TIMEOUT = 120.0
+
+# Minimum age before a lookup miss may reload the listing early
+_KEYCHAIN_INDEX_MIN_AGE = 30.0
+
+# security(1) lookup commands per keychain item class
+_KEYCHAIN_FIND_COMMANDS = {
+    "inet": "find-internet-password",
+    "genp": "find-generic-password",
+}
+
+_CLASS_PATTERN = re.compile(r'^class:\s*"?(\w+)"?', re.MULTILINE)
+
+# Prompt printed by `security -i` once it is ready for the next command
+_SECURITY_PROMPT = "security> "
+_SECURITY_START_TIMEOUT = 5.0
+
+
+@functools.lru_cache(maxsize=256)
+def _service_variations(service: str) -> Tuple[str, ...]:
+    """Common spellings of a service name that has no alias entry."""
+    service_lower = service.lower().strip()
+    # dict keeps insertion order, so the exact spelling is always tried first
+    variations = dict.fromkeys((service, service.lower(), service.capitalize()))
+    
+    # Add .com version if not present
+    if not service.endswith('.com'):
+        variations[f"{service}.com"] = None
+        variations[f"{service_lower}.com"] = None
+    
+    return tuple(variations)
+
+
+@functools.cache
+def _field_patterns(field: str) -> Tuple[re.Pattern, ...]:
+    """Compiled patterns for a keychain attribute, built once per field."""
+    return (
+        # Format: "acct"<blob>="username"
+        re.compile(rf'"{re.escape(field)}"<blob>="([^"]+)"'),
+        # Alternative format: acct: "username"
+        re.compile(rf'{re.escape(field)}\s*:\s*"([^"]+)"'),
+    )
+
 
 @dataclass
 class Credential:
@@ -37,26 +97,30 @@ class PasswordManager:
         "slack": ["slack.com", "Slack"],
     }
     
+    # Any alias, lowercased -> that service's aliases
+    _ALIAS_LOOKUP = {
+        alias.lower(): tuple(aliases)
+        for aliases in SERVICE_ALIASES.values()
+        for alias in aliases
+    }
+    
     def __init__(self):
         self.system = platform.system().lower()
+        # macOS: lowercased service name -> (item class, service name), from dump-keychain
+        self._keychain_index: Optional[Dict[str, Tuple[str, str]]] = None
+        self._keychain_index_loaded = 0.0
+        # macOS: long-lived `security -i` so lookups don't fork per item
+        self._security_proc: Optional[subprocess.Popen] = None
+        self._security_lock = threading.Lock()
     
     def _normalize_service_name(self, service: str) -> List[str]:
         """Get all possible service name variations."""
-        service_lower = service.lower().strip()
-        
-        # Check aliases
-        for key, aliases in self.SERVICE_ALIASES.items():
-            if service_lower in [a.lower() for a in aliases]:
-                return aliases
+        aliases = self._ALIAS_LOOKUP.get(service.lower().strip())
+        if aliases is not None:
+            return list(aliases)
         
         # If not in aliases, return common variations
-        variations = [service, service.lower(), service.capitalize()]
-        
-        # Add .com version if not present
-        if not service.endswith('.com'):
-            variations.extend([f"{service}.com", f"{service_lower}.com"])
-        
-        return list(set(variations))  # Remove duplicates
+        return list(_service_variations(service))
     
     def get_credential(self, service: str) -> Optional[Credential]:
         """
@@ -77,74 +141,200 @@ class PasswordManager:
         else:
             return self._get_credential_linux(service_variations)
     
-    def _get_credential_macos_keychain(self, service_variations: List[str]) -> Optional[Credential]:
-        """Retrieve credential from macOS Keychain."""
-        for service_name in service_variations:
-            try:
-                # Try to find internet password
-                cmd = [
-                    "security", "find-internet-password",
-                    "-s", service_name,
-                    "-g"  # Show password
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if result.returncode == 0:
-                    # Parse output
-                    username = self._extract_keychain_field(result.stdout, "acct")
-                    # Password is in stderr for security reasons
-                    password = self._extract_keychain_password(result.stderr)
-                    
-                    if username and password:
-                        return Credential(
-                            username=username,
-                            password=password,
-                            service=service_name,
-                            url=f"https://{service_name}" if not service_name.startswith("http") else service_name
-                        )
-            except subprocess.TimeoutExpired:
-                continue
-            except Exception:
+    def _load_keychain_index(self, reload: bool = False) -> Optional[Dict[str, Tuple[str, str]]]:
+        """Index keychain items by service name with one `security dump-keychain`.
+        
+        dump-keychain lists item attributes but not secrets, so this only tells
+        us which item to fetch. Cached for _KEYCHAIN_INDEX_TTL seconds, or
+        _KEYCHAIN_INDEX_MIN_AGE with reload=True; returns None if the keychain
+        can't be listed.
+        """
+        now = time.monotonic()
+        max_age = _KEYCHAIN_INDEX_MIN_AGE if reload else _KEYCHAIN_INDEX_TTL
+        if self._keychain_index is not None and now - self._keychain_index_loaded < max_age:
+            return self._keychain_index
+        
+        try:
+            result = subprocess.run(
+                ["security", "dump-keychain"],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+        except Exception:
+            return None
+        if result.returncode != 0:
+            return None
+        
+        index: Dict[str, Tuple[str, str]] = {}
+        # Each item starts with a keychain: line
+        for item in result.stdout.split("keychain: ")[1:]:
+            class_match = _CLASS_PATTERN.search(item)
+            item_class = class_match.group(1) if class_match else ""
+            if item_class not in _KEYCHAIN_FIND_COMMANDS:
                 continue
+            name = self._extract_keychain_field(item, "srvr" if item_class == "inet" else "svce")
+            if name:
+                index.setdefault(name.lower(), (item_class, name))
+        
+        self._keychain_index = index
+        self._keychain_index_loaded = now
+        return index
+    
+    def _get_credential_macos_keychain(self, service_variations: List[str]) -> Optional[Credential]:
+        """Retrieve credential from macOS Keychain.
         
-        # Try generic password if internet password not found
-        for service_name in service_variations:
+        A miss reloads the index (at most every _KEYCHAIN_INDEX_MIN_AGE
+        seconds), so items added since it was loaded are still found.
+        """
+        index = self._load_keychain_index()
+        if index is None:
+            # Couldn't list the keychain; probe each variation directly
+            for item_class in ("inet", "genp"):
+                for service_name in service_variations:
+                    cred = self._find_keychain_credential(item_class, service_name)
+                    if cred:
+                        return cred
+            return None
+        
+        tried = set()
+        for attempt in range(2):
+            if attempt:
+                reloaded = self._load_keychain_index(reload=True)
+                if reloaded is None or reloaded is index:
+                    break
+                index = reloaded
+            # Internet passwords take precedence over generic ones
+            hits = [index[v.lower()] for v in service_variations if v.lower() in index]
+            hits.sort(key=lambda hit: hit[0] != "inet")
+            for hit in hits:
+                if hit in tried:
+                    continue
+                tried.add(hit)
+                cred = self._find_keychain_credential(*hit)
+                if cred:
+                    return cred
+        return None
+    
+    def _find_keychain_credential(self, item_class: str, service_name: str) -> Optional[Credential]:
+        """Fetch one keychain item (with its password) by class and service name."""
+        args = [
+            _KEYCHAIN_FIND_COMMANDS[item_class],
+            "-s", service_name,
+            "-g"  # Show password
+        ]
+        # Interactive session merges stderr into its output, so both
+        # the attributes and the password line are in one string
+        try:
+            output = self._security_command(args, timeout=_KEYCHAIN_PROMPT_TIMEOUT)
+        except TimeoutError:
+            # The prompt went unanswered; a fallback would only show it again
+            return None
+        if output is not None:
+            username = self._extract_keychain_field(output, "acct")
+            password = self._extract_keychain_password(output)
+        else:
             try:
-                cmd = [
-                    "security", "find-generic-password",
-                    "-s", service_name,
-                    "-g"
-                ]
-                
                 result = subprocess.run(
-                    cmd,
+                    ["security", *args],
                     capture_output=True,
                     text=True,
-                    timeout=5
+                    timeout=_KEYCHAIN_PROMPT_TIMEOUT
                 )
-                
-                if result.returncode == 0:
-                    username = self._extract_keychain_field(result.stdout, "acct")
-                    password = self._extract_keychain_password(result.stderr)
-                    
-                    if username and password:
-                        return Credential(
-                            username=username,
-                            password=password,
-                            service=service_name,
-                            url=f"https://{service_name}" if not service_name.startswith("http") else service_name
-                        )
             except Exception:
-                continue
+                return None
+            if result.returncode != 0:
+                return None
+            # Parse output
+            username = self._extract_keychain_field(result.stdout, "acct")
+            # Password is in stderr for security reasons
+            password = self._extract_keychain_password(result.stderr)
         
+        if username and password:
+            return Credential(
+                username=username,
+                password=password,
+                service=service_name,
+                url=f"https://{service_name}" if not service_name.startswith("http") else service_name
+            )
         return None
     
+    def _security_command(self, args: List[str], timeout: float = 5.0) -> Optional[str]:
+        """Run one command through a persistent `security -i` session.
+        
+        Returns the command's combined stdout/stderr, or None if the session
+        can't be used (the caller then falls back to a one-off subprocess).
+        Raises TimeoutError if the command ran but didn't answer in timeout
+        seconds; the session is stopped.
+        """
+        if any('"' in arg or "\n" in arg for arg in args):
+            return None
+        line = " ".join(f'"{arg}"' if " " in arg else arg for arg in args)
+        
+        with self._security_lock:
+            try:
+                proc = self._security_proc
+                if proc is None or proc.poll() is not None:
+                    proc = self._security_proc = self._start_security_session(_SECURITY_START_TIMEOUT)
+                if proc is None:
+                    return None
+                proc.stdin.write(f"{line}\n".encode())
+                proc.stdin.flush()
+            except Exception:
+                self._stop_security_session()
+                return None
+            try:
+                return self._read_security_output(proc, timeout)
+            except TimeoutError:
+                self._stop_security_session()
+                raise
+            except Exception:
+                self._stop_security_session()
+                return None
+    
+    def _start_security_session(self, timeout: float) -> Optional[subprocess.Popen]:
+        proc = subprocess.Popen(
+            ["security", "-i"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        self._security_proc = proc
+        # Swallow the first prompt so each command's output starts clean
+        self._read_security_output(proc, timeout)
+        return proc
+    
+    def _read_security_output(self, proc: subprocess.Popen, timeout: float) -> str:
+        """Read until the next prompt; raises if the session stalls or exits."""
+        fd = proc.stdout.fileno()
+        prompt = _SECURITY_PROMPT.encode()
+        deadline = time.monotonic() + timeout
+        buffer = bytearray()
+        while not buffer.endswith(prompt):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError("security -i did not respond")
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                raise EOFError("security -i exited")
+            buffer += chunk
+        return buffer[:-len(prompt)].decode(errors="replace")
+    
+    def _stop_security_session(self) -> None:
+        proc, self._security_proc = self._security_proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=1)
+        except Exception:
+            pass
+    
+    def close(self) -> None:
+        """Stop the background `security` session, if one was started."""
+        with self._security_lock:
+            self._stop_security_session()
+    
     def _get_credential_windows(self, service_variations: List[str]) -> Optional[Credential]:
         """Retrieve credential from Windows Credential Manager."""
         try:
@@ -190,34 +380,18 @@ class PasswordManager:
     
     def _extract_keychain_field(self, output: str, field: str) -> str:
         """Extract a field from macOS Keychain output."""
-        # Format: "acct"<blob>="username"
-        pattern = rf'"{field}"<blob>="([^"]+)"'
-        match = re.search(pattern, output)
-        if match:
-            return match.group(1)
-        
-        # Alternative format: acct: "username"
-        pattern = rf'{field}\s*:\s*"([^"]+)"'
-        match = re.search(pattern, output)
-        if match:
-            return match.group(1)
-        
+        for pattern in _field_patterns(field):
+            match = pattern.search(output)
+            if match:
+                return match.group(1)
         return ""
     
     def _extract_keychain_password(self, stderr: str) -> str:
         """Extract password from macOS Keychain stderr output."""
-        # Format: password: "actual_password"
-        pattern = r'password:\s*"([^"]*)"'
-        match = re.search(pattern, stderr)
-        if match:
-            return match.group(1)
-        
-        # Alternative format without quotes
-        pattern = r'password:\s*(\S+)'
-        match = re.search(pattern, stderr)
-        if match:
-            return match.group(1)
-        
+        for pattern in _PASSWORD_PATTERNS:
+            match = pattern.search(stderr)
+            if match:
+                return match.group(1)
         return ""
     
     def list_services(self, limit: int = 20) -> List[str]:
@@ -225,25 +399,9 @@ class PasswordManager:
         services = []
         
         if self.system == "darwin":
-            try:
-                # List internet passwords
-                cmd = ["security", "dump-keychain"]
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0:
-                    # Parse service names from output
-                    for line in result.stdout.split('\n'):
-                        if 'srvr' in line or 'svce' in line:
-                            match = re.search(r'"([^"]+)"', line)
-                            if match:
-                                services.append(match.group(1))
-            except Exception:
-                pass
+            index = self._load_keychain_index()
+            if index:
+                services = [name for _, name in index.values()]
         
         return list(set(services))[:limit]
     
@@ -271,3 +429,9 @@ def get_password_manager() -> PasswordManager:
     if _password_manager is None:
         _password_manager = PasswordManager()
     return _password_manager
+
+
+def close_password_manager() -> None:
+    """Stop the singleton's background `security` session, if it was created."""
+    if _password_manager is not None:
+        _password_manager.close()
@@ -1,24 +1,31 @@
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, List
+from typing import Any, Deque
 
 from core.context.browsing_history import BrowsingHistory
 from core.context.filesystem_context import FileSystemContext
 
+# Oldest entries drop off once these are reached
+MAX_HISTORY = 500
+MAX_MOOD_HISTORY = 40
+
 
 @dataclass
 class SessionContext:
     last_intent: str | None = None
     last_app: str | None = None
     last_action: str | None = None
-    history: List[dict[str, Any]] = field(default_factory=list)
+    history: Deque[dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_HISTORY))
     pending_steps: list[Any] = field(default_factory=list)
     pending_clarification: dict[str, Any] | None = None
     browsing_history: BrowsingHistory = field(default_factory=BrowsingHistory)
     filesystem: FileSystemContext = field(default_factory=FileSystemContext)
-    mood_history: List[dict[str, Any]] = field(default_factory=list)
+    mood_history: Deque[dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_MOOD_HISTORY))
     last_affection: dict[str, Any] | None = None
     last_response_message: str = ""
     last_status_message: str = ""
+    # (inputs, text) of the last get_context_summary
+    _summary: tuple[tuple[Any, ...], str] | None = field(default=None, init=False, repr=False, compare=False)
 
     def record_intent(self, intent_name: str, raw_text: str) -> None:
         self.last_intent = intent_name
@@ -52,8 +59,6 @@ class SessionContext:
         }
         self.last_affection = assessment
         self.mood_history.append(payload)
-        if len(self.mood_history) > 40:
-            self.mood_history = self.mood_history[-40:]
 
     def set_last_response(self, message: str) -> None:
         self.last_response_message = message.strip()
@@ -67,22 +72,33 @@ class SessionContext:
     
     def get_context_summary(self) -> str:
         """Get a comprehensive context summary for better intent understanding."""
+        mood = risk = None
+        if self.last_affection:
+            mood = self.last_affection.get("mood_percent", 0.0)
+            risk = self.last_affection.get("risk_level", "low")
+        browsing_summary = self.browsing_history.get_context_summary()
+        fs_summary = self.filesystem.get_context_summary() if self.filesystem.indexed_files else None
+        
+        # The sub-summaries are cached strings, so an unchanged context
+        # compares by identity and reuses the joined text.
+        key = (self.last_app, mood, risk, browsing_summary, fs_summary)
+        if self._summary is not None and self._summary[0] == key:
+            return self._summary[1]
+        
         parts = []
         
         if self.last_app:
             parts.append(f"Current app: {self.last_app}")
 
         if self.last_affection:
-            mood = self.last_affection.get("mood_percent", 0.0)
-            risk = self.last_affection.get("risk_level", "low")
             parts.append(f"Recent mood: {mood:.1f}% ({risk})")
         
-        browsing_summary = self.browsing_history.get_context_summary()
         if browsing_summary and "No browsing" not in browsing_summary:
             parts.append(f"\nBrowsing context:\n{browsing_summary}")
         
-        if self.filesystem.indexed_files:
-            fs_summary = self.filesystem.get_context_summary()
+        if fs_summary is not None:
             parts.append(f"\nFile system context:\n{fs_summary}")
         
-        return "\n".join(parts) if parts else "No context available."
+        summary = "\n".join(parts) if parts else "No context available."
+        self._summary = (key, summary)
+        return summary
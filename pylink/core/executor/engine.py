@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import functools
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 import logging
-from typing import List
+from typing import Any, Callable, Dict, List, Optional
 
 from core.executor.keyboard import KeyboardController
 from core.executor.mouse import MouseController
@@ -27,7 +29,29 @@ class ExecutionEngine:
         self.verbose = verbose
         self.speed = 1.0
         self.base_action_delay = 0.12
-        self.base_typing_interval = 0.02
+        # 0 lets KeyboardController type the text in one OS call
+        self.base_typing_interval = 0.0
+        # action -> handler(action, params)
+        self._handlers: Dict[str, Callable[[str, Dict[str, Any]], None]] = {
+            "open_app": self._do_open_app,
+            "focus_app": self._do_open_app,
+            "close_app": self._do_close_app,
+            "open_url": self._do_open_url,
+            "open_file": self._do_open_file,
+            "send_text_native": self._do_send_text_native,
+            "type_text": self._do_type_text,
+            "click": self._do_click,
+            "right_click": self._do_click,
+            "double_click": self._do_click,
+            "scroll": self._do_scroll,
+            "press_key": self._do_press_key,
+            "hotkey": self._do_hotkey,
+            "send_email": self._do_hotkey,
+            "send_message": self._do_send_message,
+            "wait": self._do_wait,
+        }
+        # Runs steps that may overlap with each other (see _concurrency_key)
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="executor-step")
 
     def set_speed(self, speed: float) -> None:
         self.speed = max(0.25, min(speed, 3.0))
@@ -39,13 +63,32 @@ class ExecutionEngine:
         return self.base_typing_interval / self.speed
 
     def execute_steps(self, steps: List, guard: SafetyGuard) -> ExecutionResult:
+        # Earliest time the next step may start, so the pacing delay is
+        # waited out only when another step actually runs
+        next_start = 0.0
+        # Steps running on the pool, by concurrency key
+        in_flight: Dict[str, tuple[Future, Any]] = {}
         for index, step in enumerate(steps):
+            # A step that stops for confirmation doesn't need the delay
+            if not step.requires_confirmation:
+                remaining = next_start - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+
             if self.kill_switch.is_triggered():
                 logging.warning("Kill switch triggered. Execution halted.")
                 if self.verbose:
                     print("⚠ Kill switch activated. Stopping execution.")
+                # Don't return while steps already started are still running
+                self._join(in_flight)
                 return ExecutionResult(False, [])
 
+            key = self._concurrency_key(step)
+            if in_flight and (key is None or key in in_flight or step.requires_confirmation):
+                # Everything else waits for overlapping steps to finish
+                if not self._join(in_flight):
+                    return ExecutionResult(False, [])
+
             if step.requires_confirmation:
                 logging.info("Awaiting confirmation for action: %s", step.action)
                 step.requires_confirmation = False
@@ -55,136 +98,185 @@ class ExecutionEngine:
             if self.verbose:
                 print(f"Action {index + 1}/{len(steps)}: {step.description or step.action}")
 
+            if key is not None:
+                in_flight[key] = (self._pool.submit(self._execute_step, step), step)
+                next_start = time.monotonic() + self._scaled_delay()
+                continue
+
             try:
                 self._execute_step(step)
                 if self.verbose:
                     print(f"  ✓ {step.description or step.action} completed")
-                if index < len(steps) - 1:
-                    time.sleep(self._scaled_delay())
+                next_start = time.monotonic() + self._scaled_delay()
             except Exception as e:
-                error_msg = f"Failed to execute {step.action}: {str(e)}"
-                logging.error(error_msg)
-                if self.verbose:
-                    print(f"  ✗ {error_msg}")
+                self._report_failure(step, e)
                 return ExecutionResult(False, [])
 
+        if in_flight and not self._join(in_flight):
+            return ExecutionResult(False, [])
         return ExecutionResult(True, [])
 
+    def close(self) -> None:
+        """Wait for steps still running on the pool, then stop its threads."""
+        self._pool.shutdown(wait=True)
+
+    def _concurrency_key(self, step) -> Optional[str]:
+        """Key for steps that may run alongside others, or None to run alone.
+
+        Nearly every action moves focus or sends input, so only closing apps
+        overlaps, one step per app. Aliases are resolved first, so "chrome"
+        and "Google Chrome" never close the same app concurrently.
+        """
+        if step.action == "close_app" and not self.dry_run:
+            app_name = step.params.get("app", "").strip()
+            if app_name:
+                return f"app:{self.os.resolve_app_name(app_name).lower()}"
+        return None
+
+    def _join(self, in_flight: Dict[str, tuple[Future, Any]]) -> bool:
+        """Wait for all in-flight steps; False if any of them failed."""
+        ok = True
+        for future, step in in_flight.values():
+            try:
+                future.result()
+                if self.verbose:
+                    print(f"  ✓ {step.description or step.action} completed")
+            except Exception as e:
+                self._report_failure(step, e)
+                ok = False
+        in_flight.clear()
+        return ok
+
+    def _report_failure(self, step, error: Exception) -> None:
+        error_msg = f"Failed to execute {step.action}: {str(error)}"
+        logging.error(error_msg)
+        if self.verbose:
+            print(f"  ✗ {error_msg}")
+
     def _execute_step(self, step) -> None:
-        action = step.action
-        params = step.params
-
-        if action in {"open_app", "focus_app"}:
-            app_name = params.get("app", "")
-            if not app_name:
-                raise ValueError("App name is required for open_app/focus_app action")
-            if self.dry_run:
-                return
-            if action == "focus_app":
-                self.os.focus_app(app_name)
-            else:
-                self.os.open_app(app_name)
-        elif action == "close_app":
-            app_name = params.get("app", "")
-            if not app_name:
-                raise ValueError("App name is required for close_app action")
-            if self.dry_run:
-                return
-            self.os.close_app(app_name)
-        elif action == "open_url":
-            url = params.get("url", "")
-            if not url:
-                raise ValueError("URL is required for open_url action")
-            if self.dry_run:
-                return
-            self.os.open_url(url)
-        elif action == "open_file":
-            file_path = params.get("path", "")
-            if not file_path:
-                raise ValueError("File path is required for open_file action")
-            if self.dry_run:
-                return
-            self.os.open_file(file_path)
-        elif action == "send_text_native":
-            target = params.get("target", "")
-            content = params.get("content", "")
-            app_name = params.get("app", "Messages")
-            if not target:
-                raise ValueError("Recipient is required for send_text_native action")
-            if not content:
-                raise ValueError("Content is required for send_text_native action")
-            if self.dry_run:
-                return
-            self.os.send_text_native(app_name=app_name, target=target, content=content)
-        elif action == "type_text":
-            content = params.get("content", "")
-            if not content:
-                raise ValueError("Content is required for type_text action")
-            if self.dry_run:
-                return
-            self.keyboard.type_text(content, interval=self._scaled_typing_interval())
-        elif action == "click":
-            if self.dry_run:
-                return
-            self.mouse.click()
+        handler = self._handlers.get(step.action)
+        if handler is None:
+            raise ValueError(f"Unknown action: {step.action}")
+        handler(step.action, step.params)
+
+    def _do_open_app(self, action: str, params: Dict[str, Any]) -> None:
+        app_name = params.get("app", "")
+        if not app_name:
+            raise ValueError("App name is required for open_app/focus_app action")
+        if self.dry_run:
+            return
+        if action == "focus_app":
+            self.os.focus_app(app_name)
+        else:
+            self.os.open_app(app_name)
+
+    def _do_close_app(self, action: str, params: Dict[str, Any]) -> None:
+        app_name = params.get("app", "")
+        if not app_name:
+            raise ValueError("App name is required for close_app action")
+        if self.dry_run:
+            return
+        self.os.close_app(app_name)
+
+    def _do_open_url(self, action: str, params: Dict[str, Any]) -> None:
+        url = params.get("url", "")
+        if not url:
+            raise ValueError("URL is required for open_url action")
+        if self.dry_run:
+            return
+        self.os.open_url(url)
+
+    def _do_open_file(self, action: str, params: Dict[str, Any]) -> None:
+        file_path = params.get("path", "")
+        if not file_path:
+            raise ValueError("File path is required for open_file action")
+        if self.dry_run:
+            return
+        self.os.open_file(file_path)
+
+    def _do_send_text_native(self, action: str, params: Dict[str, Any]) -> None:
+        target = params.get("target", "")
+        content = params.get("content", "")
+        app_name = params.get("app", "Messages")
+        if not target:
+            raise ValueError("Recipient is required for send_text_native action")
+        if not content:
+            raise ValueError("Content is required for send_text_native action")
+        if self.dry_run:
+            return
+        self.os.send_text_native(app_name=app_name, target=target, content=content)
+
+    def _do_type_text(self, action: str, params: Dict[str, Any]) -> None:
+        content = params.get("content", "")
+        if not content:
+            raise ValueError("Content is required for type_text action")
+        if self.dry_run:
+            return
+        self.keyboard.type_text(
+            content,
+            interval=self._scaled_typing_interval(),
+            sensitive=params.get("sensitive", False),
+        )
+
+    def _do_click(self, action: str, params: Dict[str, Any]) -> None:
+        if self.dry_run:
+            return
+        if action == "double_click":
+            self.mouse.double_click()
         elif action == "right_click":
-            if self.dry_run:
-                return
             self.mouse.click(button="right")
-        elif action == "double_click":
-            if self.dry_run:
-                return
-            self.mouse.double_click()
-        elif action == "scroll":
-            amount = int(params.get("amount", 450))
-            direction = params.get("direction", "down")
-            signed_amount = amount if direction == "up" else -amount
-            if self.dry_run:
-                return
-            self.mouse.scroll(signed_amount)
-        elif action == "press_key":
-            key = params.get("key", "")
-            if not key:
-                raise ValueError("Key is required for press_key action")
-            if self.dry_run:
-                return
-            self.keyboard.press(_normalize_key(key))
-        elif action == "hotkey":
-            keys = params.get("keys", [])
-            if not keys:
-                raise ValueError("Keys are required for hotkey action")
-            if self.dry_run:
-                return
-            self.keyboard.hotkey(keys)
-        elif action == "send_email":
-            keys = params.get("keys", [])
-            if not keys:
-                raise ValueError("Keys are required for send_email action")
-            if self.dry_run:
-                return
-            self.keyboard.hotkey(keys)
-        elif action == "send_message":
-            key = params.get("key", "enter")
-            if self.dry_run:
-                return
-            self.keyboard.press(_normalize_key(key))
-        elif action == "wait":
-            if self.dry_run:
-                return
-            seconds = max(0.0, float(params.get("seconds", 0.5)))
-            time.sleep(seconds / self.speed)
         else:
-            raise ValueError(f"Unknown action: {action}")
+            self.mouse.click()
+
+    def _do_scroll(self, action: str, params: Dict[str, Any]) -> None:
+        amount = int(params.get("amount", 450))
+        direction = params.get("direction", "down")
+        signed_amount = amount if direction == "up" else -amount
+        if self.dry_run:
+            return
+        self.mouse.scroll(signed_amount)
+
+    def _do_press_key(self, action: str, params: Dict[str, Any]) -> None:
+        key = params.get("key", "")
+        if not key:
+            raise ValueError("Key is required for press_key action")
+        if self.dry_run:
+            return
+        self.keyboard.press(_normalize_key(key))
+
+    def _do_hotkey(self, action: str, params: Dict[str, Any]) -> None:
+        # send_email is the send shortcut of the mail app, i.e. a hotkey
+        keys = params.get("keys", [])
+        if not keys:
+            raise ValueError(f"Keys are required for {action} action")
+        if self.dry_run:
+            return
+        self.keyboard.hotkey(keys)
+
+    def _do_send_message(self, action: str, params: Dict[str, Any]) -> None:
+        key = params.get("key", "enter")
+        if self.dry_run:
+            return
+        self.keyboard.press(_normalize_key(key))
+
+    def _do_wait(self, action: str, params: Dict[str, Any]) -> None:
+        if self.dry_run:
+            return
+        seconds = max(0.0, float(params.get("seconds", 0.5)))
+        time.sleep(seconds / self.speed)
+
+
+_KEY_ALIASES = {
+    "return": "enter",
+    "spacebar": "space",
+    "escape": "esc",
+    "pgup": "pageup",
+    "pgdn": "pagedown",
+    "del": "delete",
+}
 
 
+@functools.lru_cache(maxsize=256)
 def _normalize_key(key: str) -> str:
     normalized = key.strip().lower()
-    aliases = {
-        "return": "enter",
-        "spacebar": "space",
-        "escape": "esc",
-        "pgup": "pageup",
-        "pgdn": "pagedown",
-        "del": "delete",
-    }
-    return aliases.get(normalized, normalized)
+    return _KEY_ALIASES.get(normalized, normalized)
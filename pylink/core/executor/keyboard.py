@@ -1,17 +1,226 @@
+import ctypes
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import threading
+from typing import Optional
+
 import pyautogui
 
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+from core.executor.os_control import run_applescript
+
 pyautogui.FAILSAFE = True
 
+# Longer text is pasted through the clipboard rather than typed
+_PASTE_THRESHOLD = 50
+
+# Give the target app time to read the clipboard before it's restored
+_CLIPBOARD_RESTORE_DELAY = 1.0
+
 
 class KeyboardController:
-    def type_text(self, content: str, interval: float = 0.02) -> None:
+    def __init__(self) -> None:
+        self._system = platform.system().lower()
+        # (timer, original clipboard, last pasted text) while a restore is due
+        self._pending_restore: Optional[tuple[threading.Timer, str, str]] = None
+        self._restore_lock = threading.Lock()
+
+    def type_text(self, content: str, interval: float = 0.0, sensitive: bool = False) -> None:
+        """Type content into the focused app.
+
+        Without a per-key interval, text over _PASTE_THRESHOLD characters is
+        pasted: it briefly replaces the clipboard, which is then restored.
+        Sensitive content (e.g. credentials) is never put on the clipboard.
+        """
         if content:
+            if (
+                not sensitive
+                and interval <= 0
+                and len(content) > _PASTE_THRESHOLD
+                and self._paste(content)
+            ):
+                return
+            # With no per-key delay requested, hand the whole string to the OS
+            # at once instead of sleeping between pyautogui key presses
+            if interval <= 0 and self._type_native(content):
+                return
             # Use write() instead of typewrite() to support special characters and unicode
             pyautogui.write(content, interval=interval)
 
+    def _type_native(self, content: str) -> bool:
+        """Type content with one OS-level call.
+
+        False if this platform has none available or the call failed (e.g.
+        no accessibility permission, xdotool can't reach the display), so the
+        caller falls back to pyautogui. A timeout is still raised: part of the
+        text may already have been typed, and typing it again would repeat it.
+        """
+        timeout = max(5.0, len(content) / 50)
+        try:
+            if self._system == "darwin":
+                run_applescript(_keystroke_script(content), timeout=timeout)
+                return True
+            if self._system == "windows":
+                return _send_unicode_input(content)
+            if shutil.which("xdotool") and os.environ.get("DISPLAY"):
+                # Text goes in on stdin: argv is readable by every local user (ps,
+                # /proc/<pid>/cmdline), and this path types credentials too
+                subprocess.run(
+                    ["xdotool", "type", "--delay", "0", "--file", "-"],
+                    input=content.encode("utf-8"),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=timeout,
+                    check=True,
+                )
+                return True
+        except (subprocess.CalledProcessError, OSError) as exc:
+            detail = getattr(exc, "stderr", None) or exc
+            logging.warning("Native typing failed, falling back to pyautogui: %s", detail)
+        return False
+
+    def _paste(self, content: str) -> bool:
+        """Paste content via the clipboard; False if it can't be restored afterwards.
+
+        Only text clipboards are replaced: an empty read may mean an image or
+        files, which writing text back would destroy.
+        """
+        with self._restore_lock:
+            pending = self._pending_restore
+            # Back-to-back pastes: the clipboard still holds our last paste, so
+            # keep the original from the first one instead of reading it again
+            original = pending[1] if pending else self._read_clipboard()
+            if not original or not self._write_clipboard(content):
+                return False
+            if pending:
+                pending[0].cancel()
+            pyautogui.hotkey("command" if self._system == "darwin" else "ctrl", "v")
+            # Restore in the background, once the app has had time to read the
+            # paste, and only if nothing else has replaced the clipboard since
+            timer = threading.Timer(_CLIPBOARD_RESTORE_DELAY, self._restore_clipboard)
+            timer.daemon = True
+            self._pending_restore = (timer, original, content)
+            timer.start()
+        return True
+
+    def _restore_clipboard(self) -> None:
+        with self._restore_lock:
+            pending = self._pending_restore
+            # A later paste replaced this timer after it had already fired
+            if pending is None or pending[0] is not threading.current_thread():
+                return
+            self._pending_restore = None
+            if self._read_clipboard() == pending[2]:
+                self._write_clipboard(pending[1])
+
+    def _read_clipboard(self) -> Optional[str]:
+        try:
+            if pyperclip is not None:
+                return pyperclip.paste()
+            if self._system == "darwin":
+                return subprocess.run(["pbpaste"], capture_output=True, text=True, timeout=2, check=True).stdout
+        except Exception:
+            pass
+        return None
+
+    def _write_clipboard(self, text: str) -> bool:
+        try:
+            if pyperclip is not None:
+                pyperclip.copy(text)
+                return True
+            if self._system == "darwin":
+                subprocess.run(["pbcopy"], input=text, text=True, timeout=2, check=True)
+                return True
+        except Exception:
+            pass
+        return False
+
     def press(self, key: str) -> None:
         pyautogui.press(key)
 
     def hotkey(self, keys: list[str]) -> None:
         if keys:
             pyautogui.hotkey(*keys)
+
+
+def _keystroke_script(content: str) -> str:
+    """System Events script typing content; newlines become Return presses."""
+    commands = []
+    for index, line in enumerate(content.replace("\r\n", "\n").replace("\r", "\n").split("\n")):
+        if index:
+            commands.append("key code 36")
+        if line:
+            escaped = line.replace("\\", "\\\\").replace('"', '\\"')
+            commands.append(f'keystroke "{escaped}"')
+    body = "\n    ".join(commands)
+    return f'tell application "System Events"\n    {body}\nend tell'
+
+
+# Windows SendInput structures, only used on Windows
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+_VK_RETURN = 0x0D
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.c_ushort),
+        ("wScan", ctypes.c_ushort),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    # MOUSEINPUT is the largest member; INPUT must be sized for it
+    _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+
+def _send_unicode_input(content: str) -> bool:
+    """Type content with a single SendInput call (Windows)."""
+    events = []
+
+    def key(vk: int = 0, scan: int = 0, flags: int = 0) -> None:
+        for extra in (0, _KEYEVENTF_KEYUP):
+            event = _INPUT(type=_INPUT_KEYBOARD)
+            event.union.ki = _KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags | extra)
+            events.append(event)
+
+    text = content.replace("\r\n", "\n").replace("\r", "\n")
+    # Characters outside the BMP are sent as their two UTF-16 surrogates
+    encoded = text.encode("utf-16-le")
+    for i in range(0, len(encoded), 2):
+        unit = int.from_bytes(encoded[i:i + 2], "little")
+        if unit == 0x0A:
+            key(vk=_VK_RETURN)
+        else:
+            key(scan=unit, flags=_KEYEVENTF_UNICODE)
+
+    array = (_INPUT * len(events))(*events)
+    sent = ctypes.windll.user32.SendInput(len(events), array, ctypes.sizeof(_INPUT))
+    # 0 means input was blocked and nothing was typed, so a fallback is safe
+    return sent > 0
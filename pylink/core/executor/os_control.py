@@ -1,8 +1,73 @@
 import platform
+import re
 import subprocess
-from typing import Optional
+import time
+from typing import Callable, Optional
 from urllib.parse import urlparse
 
+# Seconds an is_app_running answer is reused
+_APP_RUNNING_TTL = 2.0
+
+# Shell metacharacters rejected in app names
+_DANGEROUS_APP_CHARS = re.compile(r"[;|&$`()<>\n\r]")
+
+# Substrings that block a run_shell command
+_DANGEROUS_SHELL_PATTERN = re.compile("|".join(map(re.escape, ["rm -rf", "format", "delete", "del /f"])))
+
+# Focus the app if it's running, else launch it. The name is only resolved at
+# run time (a variable, not a literal), so a missing app errors instead of
+# showing a "Where is ...?" picker when the script is compiled.
+_OPEN_APP_SCRIPT = """
+set appName to "{app}"
+tell application "System Events" to set isRunning to (name of processes) contains appName
+if isRunning then
+    try
+        tell application appName to activate
+        return
+    end try
+end if
+do shell script "open -a " & quoted form of appName
+"""
+
+
+# runner(script, timeout) -> result text; None runs one osascript per call
+_applescript_runner: Optional[Callable[[str, float], str]] = None
+
+
+def set_applescript_runner(runner: Optional[Callable[[str, float], str]]) -> None:
+    """Run AppleScript through runner(script, timeout) instead of a new osascript each time.
+
+    Entry points install the long-lived workers shared with the Notes and
+    Reminders plugins (plugins/_osascript.py). runner must raise TimeoutError
+    on timeout and RuntimeError if the script fails.
+    """
+    global _applescript_runner
+    _applescript_runner = runner
+
+
+def run_applescript(script: str, timeout: float = 5.0) -> str:
+    """Run AppleScript source (macOS) and return its result as text.
+
+    Fails like subprocess.run(check=True) would: CalledProcessError with the
+    script error in stderr, or TimeoutExpired.
+    """
+    runner = _applescript_runner
+    if runner is None:
+        result = subprocess.run(
+            ["osascript", "-e", script],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=True,
+        )
+        return result.stdout.strip()
+    try:
+        return runner(script, timeout)
+    except TimeoutError:
+        raise subprocess.TimeoutExpired("osascript", timeout) from None
+    except RuntimeError as exc:
+        raise subprocess.CalledProcessError(1, ["osascript"], output="", stderr=str(exc)) from None
+
 
 class OSController:
     # Common app name whitelist for validation (can be extended)
@@ -25,10 +90,18 @@ class OSController:
         "outlook": "Microsoft Outlook",
         "teams": "Microsoft Teams",
     }
+    # Names that are already resolved, so they skip the lowercase lookup
+    _CANONICAL_APP_NAMES = frozenset(APP_NAME_ALIASES.values())
+
+    def __init__(self) -> None:
+        # platform.system() is fixed for the process; look it up once
+        self._system = platform.system().lower()
+        # lowercased app name -> (checked at, running), see is_app_running
+        self._running_cache: dict[str, tuple[float, bool]] = {}
 
-    def _resolve_app_name(self, app_name: str) -> str:
+    def resolve_app_name(self, app_name: str) -> str:
         """Resolve common app name aliases to actual macOS app names."""
-        if platform.system().lower() != "darwin":
+        if self._system != "darwin" or app_name in self._CANONICAL_APP_NAMES:
             return app_name
         return self.APP_NAME_ALIASES.get(app_name.lower(), app_name)
 
@@ -38,10 +111,9 @@ class OSController:
             raise ValueError("App name cannot be empty")
 
         # Check for shell metacharacters that could be dangerous
-        dangerous_chars = [";", "|", "&", "$", "`", "(", ")", "<", ">", "\n", "\r"]
-        for char in dangerous_chars:
-            if char in app_name:
-                raise ValueError(f"Invalid app name: contains dangerous character '{char}'")
+        match = _DANGEROUS_APP_CHARS.search(app_name)
+        if match:
+            raise ValueError(f"Invalid app name: contains dangerous character '{match.group()}'")
     
     def is_app_running(self, app_name: str) -> bool:
         """Check if an application is currently running."""
@@ -49,19 +121,24 @@ class OSController:
             return False
 
         self._validate_app_name(app_name)
-        app_name = self._resolve_app_name(app_name)
-        system = platform.system().lower()
+        app_name = self.resolve_app_name(app_name)
+        system = self._system
+
+        # Steps in one plan often check the same app; reuse a fresh answer
+        key = app_name.lower()
+        now = time.monotonic()
+        hit = self._running_cache.get(key)
+        if hit is not None and now - hit[0] < _APP_RUNNING_TTL:
+            return hit[1]
         
         try:
             if system == "darwin":
                 # Use osascript to check if app is running
-                result = subprocess.run(
-                    ["osascript", "-e", f'tell application "System Events" to (name of processes) contains "{app_name}"'],
-                    capture_output=True,
-                    text=True,
+                result = run_applescript(
+                    f'tell application "System Events" to ((name of processes) contains "{app_name}") as text',
                     timeout=2,
                 )
-                return result.stdout.strip().lower() == "true"
+                running = result.strip().lower() == "true"
             elif system == "windows":
                 result = subprocess.run(
                     ["tasklist", "/FI", f"IMAGENAME eq {app_name}.exe"],
@@ -69,7 +146,7 @@ class OSController:
                     text=True,
                     timeout=2,
                 )
-                return app_name.lower() in result.stdout.lower()
+                running = app_name.lower() in result.stdout.lower()
             else:  # Linux
                 result = subprocess.run(
                     ["pgrep", "-f", app_name],
@@ -77,10 +154,12 @@ class OSController:
                     text=True,
                     timeout=2,
                 )
-                return bool(result.stdout.strip())
+                running = bool(result.stdout.strip())
         except Exception:
             # If we can't determine, assume not running (will try to open)
             return False
+        self._running_cache[key] = (now, running)
+        return running
 
     def _validate_url(self, url: str) -> None:
         parsed = urlparse(url)
@@ -94,32 +173,34 @@ class OSController:
             raise ValueError("App name is required")
 
         self._validate_app_name(app_name)
-        app_name = self._resolve_app_name(app_name)
+        app_name = self.resolve_app_name(app_name)
+
+        system = self._system
 
         # Check if app is already running - if so, just focus it
-        if self.is_app_running(app_name):
+        # (on macOS the launch script does this check itself)
+        if system != "darwin" and self.is_app_running(app_name):
             try:
                 self.focus_app(app_name)
                 return  # App was already running, we focused it
             except Exception:
                 # If focus fails, fall through to opening
                 pass
-        
-        system = platform.system().lower()
 
+        # Launching changes the answer
+        self._running_cache.pop(app_name.lower(), None)
         try:
             if system == "darwin":
-                result = subprocess.run(
-                    ["open", "-a", app_name],
-                    capture_output=True,
-                    text=True,
+                # One round-trip: activate if running, otherwise launch
+                run_applescript(
+                    _OPEN_APP_SCRIPT.format(app=_escape_applescript_text(app_name)),
                     timeout=5,
-                    check=True
                 )
             elif system == "windows":
                 result = subprocess.run(
                     ["cmd", "/c", "start", "", app_name],
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     timeout=5,
                     check=True
@@ -127,7 +208,8 @@ class OSController:
             else:  # Linux
                 result = subprocess.run(
                     ["xdg-open", app_name],
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     timeout=5,
                     check=True
@@ -147,27 +229,22 @@ class OSController:
             raise ValueError("App name is required")
 
         self._validate_app_name(app_name)
-        app_name = self._resolve_app_name(app_name)
-        system = platform.system().lower()
+        app_name = self.resolve_app_name(app_name)
+        system = self._system
 
         if system == "darwin":
             try:
                 # First open the app
                 subprocess.run(
                     ["open", "-a", app_name],
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     timeout=5,
                     check=True
                 )
                 # Then activate/focus it
-                subprocess.run(
-                    ["osascript", "-e", f'tell application "{app_name}" to activate'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    check=True
-                )
+                run_applescript(f'tell application "{app_name}" to activate', timeout=5)
             except subprocess.CalledProcessError as e:
                 error_output = e.stderr.strip() if e.stderr else str(e)
                 raise RuntimeError(f"Failed to focus app '{app_name}': {error_output}")
@@ -181,21 +258,17 @@ class OSController:
         if not app_name:
             raise ValueError("App name is required")
         self._validate_app_name(app_name)
-        app_name = self._resolve_app_name(app_name)
-        system = platform.system().lower()
+        app_name = self.resolve_app_name(app_name)
+        system = self._system
+        self._running_cache.pop(app_name.lower(), None)
         try:
             if system == "darwin":
-                subprocess.run(
-                    ["osascript", "-e", f'tell application "{app_name}" to quit'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    check=True,
-                )
+                run_applescript(f'tell application "{app_name}" to quit', timeout=5)
             elif system == "windows":
                 subprocess.run(
                     ["taskkill", "/IM", f"{app_name}.exe", "/F"],
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     timeout=5,
                     check=True,
@@ -203,7 +276,8 @@ class OSController:
             else:
                 subprocess.run(
                     ["pkill", "-f", app_name],
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     timeout=5,
                     check=True,
@@ -216,14 +290,14 @@ class OSController:
         if not url:
             raise ValueError("URL is required")
         self._validate_url(url)
-        system = platform.system().lower()
+        system = self._system
         try:
             if system == "darwin":
-                subprocess.run(["open", url], capture_output=True, text=True, timeout=5, check=True)
+                subprocess.run(["open", url], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=5, check=True)
             elif system == "windows":
-                subprocess.run(["cmd", "/c", "start", "", url], capture_output=True, text=True, timeout=5, check=True)
+                subprocess.run(["cmd", "/c", "start", "", url], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=5, check=True)
             else:
-                subprocess.run(["xdg-open", url], capture_output=True, text=True, timeout=5, check=True)
+                subprocess.run(["xdg-open", url], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=5, check=True)
         except subprocess.CalledProcessError as e:
             error_output = e.stderr.strip() if e.stderr else str(e)
             raise RuntimeError(f"Failed to open URL '{url}': {error_output}")
@@ -231,20 +305,20 @@ class OSController:
     def open_file(self, file_path: str) -> None:
         if not file_path:
             raise ValueError("File path is required")
-        system = platform.system().lower()
+        system = self._system
         try:
             if system == "darwin":
-                subprocess.run(["open", file_path], capture_output=True, text=True, timeout=5, check=True)
+                subprocess.run(["open", file_path], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=5, check=True)
             elif system == "windows":
-                subprocess.run(["cmd", "/c", "start", "", file_path], capture_output=True, text=True, timeout=5, check=True)
+                subprocess.run(["cmd", "/c", "start", "", file_path], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=5, check=True)
             else:
-                subprocess.run(["xdg-open", file_path], capture_output=True, text=True, timeout=5, check=True)
+                subprocess.run(["xdg-open", file_path], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=5, check=True)
         except subprocess.CalledProcessError as e:
             error_output = e.stderr.strip() if e.stderr else str(e)
             raise RuntimeError(f"Failed to open file '{file_path}': {error_output}")
 
     def send_text_native(self, app_name: str, target: str, content: str) -> None:
-        system = platform.system().lower()
+        system = self._system
         if system != "darwin":
             raise RuntimeError("Native text sending is currently only supported on macOS")
         _ = app_name
@@ -351,13 +425,7 @@ tell application "Messages"
 end tell
 '''
         try:
-            subprocess.run(
-                ["osascript", "-e", script],
-                capture_output=True,
-                text=True,
-                timeout=8,
-                check=True,
-            )
+            run_applescript(script, timeout=8)
         except subprocess.CalledProcessError as e:
             error_output = e.stderr.strip() if e.stderr else str(e)
             raise RuntimeError(f"Failed to send text in '{app_name}': {error_output}")
@@ -369,7 +437,7 @@ end tell
 
         # Basic validation - reject commands with suspicious patterns
         cmd_str = " ".join(command)
-        if any(pattern in cmd_str for pattern in ["rm -rf", "format", "delete", "del /f"]):
+        if _DANGEROUS_SHELL_PATTERN.search(cmd_str):
             raise ValueError(f"Blocked potentially dangerous command: {cmd_str}")
 
         try:
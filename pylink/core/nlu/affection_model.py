@@ -626,7 +626,7 @@ class AffectionNLUModel:
 
         # Emotional resilience (from history)
         if session and hasattr(session, "mood_history") and session.mood_history:
-            recent_moods = [m.get("mood_percent", 50) for m in session.mood_history[-10:]]
+            recent_moods = [m.get("mood_percent", 50) for m in list(session.mood_history)[-10:]]
             if recent_moods:
                 avg = sum(recent_moods) / len(recent_moods)
                 cs.emotional_resilience = _bounded(avg / 100.0, 0.0, 1.0)
@@ -650,7 +650,7 @@ class AffectionNLUModel:
         if not session or not getattr(session, "mood_history", None):
             return traj
 
-        recent = session.mood_history[-12:]
+        recent = list(session.mood_history)[-12:]
         scores = [float(m.get("mood_percent", 50.0)) for m in recent if "mood_percent" in m]
         if not scores:
             return traj
@@ -123,6 +123,8 @@ class EmotionalIntelligenceEngine:
         self._cached_reminders: list[dict] | None = None
         self._cache_time: datetime | None = None
         self._cache_ttl = timedelta(minutes=5)
+        self._cache_generation = 0
+        self._refresh_task: asyncio.Future | None = None
 
     async def fetch_calendar_events(self, max_results: int = 20) -> list[dict]:
         """Fetch upcoming Google Calendar events."""
@@ -163,28 +165,47 @@ class EmotionalIntelligenceEngine:
             return []
 
     async def gather_schedule_data(self) -> tuple[list[dict], list[dict]]:
-        """Fetch both calendar events and reminders, with caching."""
+        """Fetch both calendar events and reminders, with caching.
+
+        Once cached data is past half its TTL, a refresh is started in the
+        background so the next call is still served from cache. Concurrent
+        callers share a single in-flight fetch.
+        """
         now = datetime.now(timezone.utc)
         if (
             self._cached_events is not None
             and self._cache_time
             and (now - self._cache_time) < self._cache_ttl
         ):
+            if now - self._cache_time >= self._cache_ttl / 2:
+                self._start_refresh()
             return self._cached_events, self._cached_reminders or []
 
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Future:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._fetch_schedule(self._cache_generation))
+        return self._refresh_task
+
+    async def _fetch_schedule(self, generation: int) -> tuple[list[dict], list[dict]]:
         events, reminders = await asyncio.gather(
             self.fetch_calendar_events(),
             self.fetch_reminders(),
         )
-        self._cached_events = events
-        self._cached_reminders = reminders
-        self._cache_time = now
+        # Don't let a fetch that started before invalidate_cache() repopulate it
+        if generation == self._cache_generation:
+            self._cached_events = events
+            self._cached_reminders = reminders
+            self._cache_time = datetime.now(timezone.utc)
         return events, reminders
 
     def invalidate_cache(self) -> None:
         self._cached_events = None
         self._cached_reminders = None
         self._cache_time = None
+        self._cache_generation += 1
+        self._refresh_task = None
 
     def analyze_schedule_with_emotion(
         self,
@@ -3,20 +3,116 @@ LLM Brain for PixelLink Voice Agent.
 Uses OpenAI to understand natural language commands and provide conversational interaction.
 """
 
+import functools
+import hashlib
+import importlib.util
 import json
 import os
 import logging
-from typing import Optional, List, Dict, Any
-
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Any
 
 from core.nlu.intents import Intent
 
-load_dotenv()
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
+
+# Keep API connections alive between turns so follow-up requests skip TCP/TLS setup
+_HTTP_LIMITS = {"max_keepalive_connections": 20, "max_connections": 100, "keepalive_expiry": 30.0}
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@functools.cache
+def _load_env() -> None:
+    """Load .env once, on first use rather than at import."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_openai_client(api_key: str) -> "OpenAI":
+    """Return the process-wide OpenAI client for an API key.
+
+    Building a client is not free (SSL context, HTTP connection pool), so
+    ConversationalAI and OpenAIBrain share one and its open connections.
+    """
+    # openai pulls in httpx and pydantic; import them only when a client is needed
+    import httpx
+    from openai import OpenAI
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(**_HTTP_LIMITS),
+        http2=_HTTP2_AVAILABLE,
+        follow_redirects=True,
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+# Identical requests (same model, messages and sampling) get the stored reply
+# instead of another API round-trip. Sampled replies above this temperature
+# are meant to vary, so they are never cached.
+_RESPONSE_CACHE_SIZE = 256
+_MAX_CACHEABLE_TEMPERATURE = 0.5
+
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _response_cache_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> Optional[str]:
+    if temperature > _MAX_CACHEABLE_TEMPERATURE:
+        return None
+    payload = json.dumps([model, messages, temperature, max_tokens], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_cached_response(key: Optional[str]) -> Optional[str]:
+    if key is None:
+        return None
+    with _response_cache_lock:
+        text = _response_cache.get(key)
+        if text is not None:
+            _response_cache.move_to_end(key)
+        return text
+
+
+def _store_response(key: Optional[str], text: str) -> None:
+    """Cache a reply. Callers store only replies they could parse."""
+    if key is None:
+        return
+    with _response_cache_lock:
+        _response_cache[key] = text
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+# Older assistant replies in the conversation history are cut down to these
+# fields; the newest reply is kept verbatim as the format example.
+_COMPACT_REPLY_FIELDS = ("status", "intent", "entities")
+_COMPACT_REPLY_MAX_CHARS = 200
+
+
+def _compact_reply(text: str) -> str:
+    """Shorten a stored assistant reply to the decision it recorded."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text[:_COMPACT_REPLY_MAX_CHARS]
+    if not isinstance(data, dict):
+        return text[:_COMPACT_REPLY_MAX_CHARS]
+    summary = {key: data[key] for key in _COMPACT_REPLY_FIELDS if key in data}
+    return json.dumps(summary, separators=(",", ":"))
+
+
 # List of sensitive/irreversible actions that require explicit confirmation
 SENSITIVE_ACTIONS = {
     "send_email": "sending an email",
@@ -197,6 +293,17 @@ Important rules:
 """
 
 
+@dataclass(slots=True)
+class _Turn:
+    """One stored conversation message (slotted: smaller than a dict per turn)."""
+
+    role: str
+    content: str
+
+    def to_message(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+
 class ConversationalAI:
     """Conversational AI that asks clarifying questions and handles sensitive actions."""
 
@@ -206,13 +313,14 @@ class ConversationalAI:
         Args:
             api_key: OpenAI API key. If not provided, reads from OPENAI_API_KEY env var.
         """
+        _load_env()
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY in .env file.")
 
-        self.client = OpenAI(api_key=self.api_key, timeout=30.0)  # 30 second timeout
+        self.client = _get_openai_client(self.api_key).with_options(timeout=30.0)  # 30 second timeout
         self.model_id = "gpt-4o-mini"  # Use GPT-4o-mini for faster responses
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history: List[_Turn] = []
         self.pending_action: Optional[Dict[str, Any]] = None
         logger.info(f"ConversationalAI initialized with model: {self.model_id}")
 
@@ -275,35 +383,50 @@ class ConversationalAI:
                     context_info += f"Browsing context: {browsing_context}\n"
 
             # Add user message to history
-            user_message = f"{context_info}User said: \"{text}\""
-            self.conversation_history.append({"role": "user", "content": user_message})
+            user_message = f"User said: \"{text}\""
+            self.conversation_history.append(_Turn("user", user_message))
 
             # Build messages for API call
             messages = [
                 {"role": "system", "content": CONVERSATIONAL_SYSTEM_PROMPT},
-            ] + self.conversation_history[-10:]  # Keep last 10 messages for context
-
-            # Call OpenAI
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=messages,
-                temperature=0.3,
-                max_tokens=512,
-            )
-            response_text = response.choices[0].message.content.strip()
-
-            # Clean up response - remove markdown code blocks if present
-            if response_text.startswith("```"):
-                lines = response_text.split("\n")
-                response_text = "\n".join(lines[1:-1])
+            ] + [turn.to_message() for turn in self.conversation_history[-10:]]  # Keep last 10 messages for context
+
+            # Session context is only attached to the current turn. Storing it in
+            # history re-sent a near-identical context block with every past turn.
+            if context_info:
+                messages[-1] = {"role": "user", "content": f"{context_info}{user_message}"}
+
+            # Call OpenAI (or reuse the reply to an identical request)
+            cache_key = _response_cache_key(self.model_id, messages, 0.3, 512)
+            response_text = _get_cached_response(cache_key)
+            if response_text is None:
+                response = self.client.chat.completions.create(
+                    model=self.model_id,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=512,
+                )
+                response_text = response.choices[0].message.content.strip()
+
+                # Clean up response - remove markdown code blocks if present
+                if response_text.startswith("```"):
+                    lines = response_text.split("\n")
+                    response_text = "\n".join(lines[1:-1])
 
             # Parse JSON response
             data = json.loads(response_text)
-
-            # Add assistant response to history (keep last 20 messages to avoid context overflow)
-            self.conversation_history.append({"role": "assistant", "content": response_text})
+            _store_response(cache_key, response_text)
+
+            # Add assistant response to history (keep last 20 messages to avoid context overflow).
+            # The previous reply is compacted first, so every request doesn't
+            # re-send several full JSON replies.
+            for turn in reversed(self.conversation_history):
+                if turn.role == "assistant":
+                    turn.content = _compact_reply(turn.content)
+                    break
+            self.conversation_history.append(_Turn("assistant", response_text))
             if len(self.conversation_history) > 20:
-                self.conversation_history = self.conversation_history[-20:]
+                del self.conversation_history[:-20]
 
             # Store pending action if it's a sensitive action needing confirmation
             if data.get("status") == "confirm_sensitive":
@@ -337,6 +460,14 @@ class ConversationalAI:
                 "user_message": f"I encountered an issue. Let's try again - what can I help you with?",
             }
 
+    def warm_up(self) -> None:
+        """Open the pooled API connection ahead of the first request.
+
+        A cheap metadata call pays the TCP/TLS handshake up front; the
+        connection is then kept alive for the first analyze_request.
+        """
+        self.client.models.retrieve(self.model_id)
+
     def get_pending_action(self) -> Optional[Dict[str, Any]]:
         """Get the pending action awaiting confirmation."""
         return self.pending_action
@@ -349,7 +480,8 @@ class ConversationalAI:
         self,
         intent: str,
         success: bool,
-        result_message: str = ""
+        result_message: str = "",
+        on_delta: Optional[Callable[[str], None]] = None,
     ) -> str:
         """Generate a friendly completion message after task execution.
 
@@ -357,6 +489,9 @@ class ConversationalAI:
             intent: The intent that was executed.
             success: Whether the task succeeded.
             result_message: Optional result details.
+            on_delta: Optional callback. When given, the reply is streamed
+                and each text fragment is passed to it as it arrives, so
+                output can start before the full message is generated.
 
         Returns:
             A friendly completion message.
@@ -385,8 +520,18 @@ Confirm what was done."""
                 ],
                 temperature=0.7,
                 max_tokens=100,
+                stream=on_delta is not None,
             )
-            return response.choices[0].message.content.strip()
+            if on_delta is None:
+                return response.choices[0].message.content.strip()
+
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
+            return "".join(parts).strip()
         except Exception as e:
             logger.error(f"Error generating completion message: {e}")
             return f"Done! {result_message}" if result_message else "Task completed successfully."
@@ -409,11 +554,12 @@ class OpenAIBrain:
         Args:
             api_key: OpenAI API key. If not provided, reads from OPENAI_API_KEY env var.
         """
+        _load_env()
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY in .env file.")
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = _get_openai_client(self.api_key)
         # Use gpt-4o-mini - fast and good for intent parsing
         self.model_id = "gpt-4o-mini"
         logger.info(f"OpenAI brain initialized with model: {self.model_id}")
@@ -439,26 +585,32 @@ class OpenAIBrain:
             if context and context.get("last_intent"):
                 prompt = f"Previous intent: {context['last_intent']}\n\n{prompt}"
 
-            # Call OpenAI
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=256,
-            )
-            response_text = response.choices[0].message.content.strip()
-
-            # Clean up response - remove markdown code blocks if present
-            if response_text.startswith("```"):
-                lines = response_text.split("\n")
-                # Remove first and last lines (```json and ```)
-                response_text = "\n".join(lines[1:-1])
+            messages = [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+
+            # Call OpenAI (or reuse the reply to an identical request)
+            cache_key = _response_cache_key(self.model_id, messages, 0.1, 256)
+            response_text = _get_cached_response(cache_key)
+            if response_text is None:
+                response = self.client.chat.completions.create(
+                    model=self.model_id,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=256,
+                )
+                response_text = response.choices[0].message.content.strip()
+
+                # Clean up response - remove markdown code blocks if present
+                if response_text.startswith("```"):
+                    lines = response_text.split("\n")
+                    # Remove first and last lines (```json and ```)
+                    response_text = "\n".join(lines[1:-1])
 
             # Parse JSON
             data = json.loads(response_text)
+            _store_response(cache_key, response_text)
 
             intent_name = data.get("intent", "unknown")
             entities = data.get("entities", {})
@@ -509,6 +661,34 @@ def parse_with_llm(text: str, context: Optional[dict] = None) -> Intent:
     return brain.parse(text, context)
 
 
+def parse_many_with_llm(
+    texts: List[str],
+    context: Optional[dict] = None,
+    max_concurrency: int = 8,
+) -> List[Intent]:
+    """Parse several independent inputs concurrently.
+
+    Useful for evaluation or replaying logged commands. OpenAIBrain.parse is
+    stateless and network-bound, so the calls run on a small thread pool
+    rather than one after another.
+
+    Args:
+        texts: Inputs to parse.
+        context: Optional context dictionary applied to every input.
+        max_concurrency: Maximum number of requests in flight at once.
+
+    Returns:
+        One Intent per input, in the same order as texts.
+    """
+    if not texts:
+        return []
+
+    brain = get_brain()
+    workers = max(1, min(max_concurrency, len(texts)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-parse") as executor:
+        return list(executor.map(lambda text: brain.parse(text, context), texts))
+
+
 # Global conversational AI instance
 _conversational_ai: Optional[ConversationalAI] = None
 
@@ -544,16 +724,22 @@ def analyze_with_conversation(
     return ai.analyze_request(text, context)
 
 
-def generate_completion_message(intent: str, success: bool, result: str = "") -> str:
+def generate_completion_message(
+    intent: str,
+    success: bool,
+    result: str = "",
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> str:
     """Generate a friendly completion message after task execution.
 
     Args:
         intent: The intent that was executed.
         success: Whether the task succeeded.
         result: Optional result details.
+        on_delta: Optional callback receiving the reply as it streams in.
 
     Returns:
         A friendly completion message.
     """
     ai = get_conversational_ai()
-    return ai.generate_completion_message(intent, success, result)
+    return ai.generate_completion_message(intent, success, result, on_delta=on_delta)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import json
 import re
 import threading
 from dataclasses import asdict
+from itertools import islice
 from typing import Any
 
+from core.context.password_manager import close_password_manager
 from core.context.session import SessionContext
 from core.executor.engine import ExecutionEngine
 from core.nlu.affection_model import AffectionNLUModel
@@ -22,6 +27,11 @@ from core.safety.guard import KillSwitch, SafetyGuard
 from core.browser.browser_agent import BrowserAgent, get_browser_agent, close_browser_agent
 
 
+# Seconds to wait for calendar/reminder data: the prefetch only enriches mood
+# analysis, so it gives up quickly; explicit schedule requests wait longer
+_SCHEDULE_PREFETCH_TIMEOUT = 2.0
+_SCHEDULE_FETCH_TIMEOUT = 15.0
+
 DEFAULT_PERMISSION_PROFILE = {
     "open_app": True,
     "focus_app": True,
@@ -58,6 +68,50 @@ DEFAULT_PERMISSION_PROFILE = {
 }
 
 
+# Pre-task announcements, keyed by intent name. Only the matching entry is
+# formatted, instead of building every message on each request.
+_PRE_TASK_MESSAGES: dict[str, Any] = {
+    "open_app": lambda e: f"Opening {e.get('app', 'the application')}.",
+    "close_app": lambda e: f"Closing {e.get('app', 'the application')}.",
+    "focus_app": lambda e: f"Switching to {e.get('app', 'the application')}.",
+    "type_text": lambda e: "Typing the text you requested.",
+    "search_web": lambda e: f"Searching the web for '{e.get('query', '')}'.",
+    "send_text": lambda e: f"Sending a message to {e.get('target', 'the recipient')}.",
+    "send_email": lambda e: "Composing and sending the email.",
+    "reply_email": lambda e: "Composing the email reply.",
+    "browser_task": lambda e: f"Working on the browser task: {e.get('instruction', '')[:60]}.",
+    "browser_fill_form": lambda e: "Filling out the form in the browser.",
+    "browser_click": lambda e: f"Clicking on {e.get('element', 'the element')} in the browser.",
+    "browser_extract": lambda e: "Extracting content from the page.",
+    "close_browser": lambda e: "Closing the browser.",
+    "open_website": lambda e: f"Opening {e.get('url', 'the website')}.",
+    "login": lambda e: f"Logging into {e.get('service', 'the service')}.",
+    "mcp_create_reminder": lambda e: f"Creating a reminder: {e.get('name', '')}.",
+    "mcp_create_note": lambda e: f"Creating a note: {e.get('title', '')}.",
+}
+
+# Simple, fast completion messages
+_COMPLETION_MESSAGES = {
+    "open_app": "Done! The app is now open.",
+    "close_app": "Done! The app has been closed.",
+    "open_website": "Done! The website is now open.",
+    "search_web": "Done! Here are your search results.",
+    "type_text": "Done! I've typed the text.",
+    "click": "Done! I've clicked that for you.",
+    "scroll": "Done! I've scrolled the page.",
+    "press_key": "Done! Key pressed.",
+    "hotkey": "Done! Keyboard shortcut activated.",
+}
+
+# Planner MCP actions -> (plugin tool name, error when the plugin isn't loaded,
+# params that must be non-empty). Steps failing the check are rejected before
+# any AppleScript/API round-trip is made.
+_MCP_STEP_TOOLS = {
+    "mcp_create_reminder": ("reminders_create_reminder", "Reminders tool not available", ("list_name", "name")),
+    "mcp_create_note": ("notes_create_note", "Notes tool not available", ("folder_name", "title")),
+}
+
+
 class MaesRuntime:
     """Runtime orchestrator (alias PixelLinkRuntime for backward compatibility)."""
 
@@ -94,11 +148,18 @@ class MaesRuntime:
         # Browser agent for AI-powered browser automation
         self._browser_agent: BrowserAgent | None = None
         self._browser_headless = False
+        self._browser_lock = threading.Lock()
 
         # Conversational AI for user interaction
         self._conversational_ai = get_conversational_ai()
         self._use_conversational_mode = True  # Enable conversational AI by default
 
+        # One event loop for the runtime's lifetime, running on its own thread.
+        # Reusing it avoids per-call loop setup and keeps loop-bound state
+        # (e.g. the browser session) valid between requests.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
+
         # Pre-task announcement callback (called BEFORE execution)
         self._on_pre_task_announce: Any | None = None
 
@@ -113,13 +174,40 @@ class MaesRuntime:
     def close(self) -> None:
         if self.enable_kill_switch:
             self.kill_switch.stop()
+        self.executor.close()
         # Close browser agent if it exists
         if self._browser_agent:
             try:
-                import asyncio
-                asyncio.run(self._browser_agent.close())
+                self._run_async(self._browser_agent.close())
             except Exception:
                 pass
+        close_password_manager()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    def _submit_async(self, coro: Any) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime's event loop without waiting."""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="maes-runtime-loop", daemon=True).start()
+                    self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _run_async(self, coro: Any, timeout: float | None = None) -> Any:
+        """Run a coroutine on the runtime's event loop and wait for its result.
+
+        With a timeout, the coroutine is cancelled and TimeoutError raised
+        if it hasn't finished in time.
+        """
+        future = self._submit_async(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Timed out after {timeout:g}s") from None
 
     def set_pre_task_callback(self, callback: Any) -> None:
         """Set a callback that fires BEFORE task execution with the announcement message."""
@@ -129,8 +217,7 @@ class MaesRuntime:
         """Close the browser and clean up."""
         if self._browser_agent:
             try:
-                import asyncio
-                asyncio.run(self._browser_agent.close())
+                self._run_async(self._browser_agent.close())
                 self._browser_agent = None
                 msg = "Browser closed successfully."
                 if pre_message:
@@ -144,9 +231,32 @@ class MaesRuntime:
     def _get_browser_agent(self) -> BrowserAgent:
         """Get or create the browser agent instance."""
         if self._browser_agent is None:
-            self._browser_agent = BrowserAgent(headless=self._browser_headless)
+            with self._browser_lock:
+                if self._browser_agent is None:
+                    self._browser_agent = BrowserAgent(headless=self._browser_headless)
         return self._browser_agent
 
+    def warm_up_async(self) -> None:
+        """Warm the LLM connection and browser automation in a background thread.
+
+        Keeps the first request from paying for the API handshake and the
+        browser-use import/initialization, at the cost of doing both (an API
+        call included) even if the session never needs them; the desktop
+        bridge only calls this when MAES_WARM_UP is set. Failures are ignored;
+        the normal request path will surface them.
+        """
+        def _run() -> None:
+            try:
+                self._conversational_ai.warm_up()
+            except Exception:
+                pass
+            try:
+                self._run_async(self._get_browser_agent().warm_up())
+            except Exception:
+                pass
+
+        threading.Thread(target=_run, name="runtime-warmup", daemon=True).start()
+
     async def _execute_browser_action(self, action: str, params: dict) -> dict[str, Any]:
         """Execute a browser automation action."""
         agent = self._get_browser_agent()
@@ -232,18 +342,22 @@ class MaesRuntime:
         if self.session.pending_steps and deterministic_intent.name in {"confirm", "cancel"}:
             return self._handle_pending(deterministic_intent.name, source)
 
+        # Start fetching calendar/reminder data now so it overlaps with mood
+        # analysis; it is joined before mood enrichment below.
+        schedule_future = self._submit_async(self.emotional_intelligence.gather_schedule_data())
+
         affection_assessment = self.affection_nlu.analyze(cleaned_text, self.session)
 
         # Enrich with real calendar/reminder data when available
         try:
-            import asyncio
-            events, reminders = asyncio.run(
-                self.emotional_intelligence.gather_schedule_data()
-            )
+            events, reminders = schedule_future.result(timeout=_SCHEDULE_PREFETCH_TIMEOUT)
             affection_assessment = self.affection_nlu.enrich_with_schedule(
                 affection_assessment, events, reminders
             )
         except Exception:
+            # Slow or failed fetch: go on without it (a shared refresh keeps
+            # running in the background and fills the cache for next time)
+            schedule_future.cancel()
             events, reminders = [], []
 
         self._current_affection = affection_assessment.to_dict()
@@ -343,7 +457,7 @@ class MaesRuntime:
             "last_intent": self.session.history[-1]["intent"] if self.session.history else None,
             "last_app": self.session.last_app,
             "pending_clarification": self.session.pending_clarification,
-            "recent_history": self.session.history[-10:] if self.session.history else [],
+            "recent_history": list(islice(reversed(self.session.history), 10))[::-1],
             "browsing_context": self.session.get_context_summary() if hasattr(self.session, 'get_context_summary') else "",
         }
 
@@ -480,7 +594,6 @@ class MaesRuntime:
         pre_message: str = ""
     ) -> dict[str, Any]:
         """Execute browser action and confirm completion to user."""
-        import asyncio
 
         # Generate pre-task announcement
         pre_task_msg = pre_message or self._generate_pre_task_message(intent)
@@ -497,7 +610,7 @@ class MaesRuntime:
         for step in steps:
             if step.action.startswith("browser_"):
                 try:
-                    result = asyncio.run(self._execute_browser_action(step.action, step.params))
+                    result = self._run_async(self._execute_browser_action(step.action, step.params))
 
                     success = result.get("success", False)
                     result_msg = result.get("message", "")
@@ -547,30 +660,10 @@ class MaesRuntime:
 
     def _generate_pre_task_message(self, intent: Intent) -> str:
         """Generate a brief announcement of what's about to happen."""
-        name = intent.name
-        entities = intent.entities or {}
-
-        descriptions = {
-            "open_app": f"Opening {entities.get('app', 'the application')}.",
-            "close_app": f"Closing {entities.get('app', 'the application')}.",
-            "focus_app": f"Switching to {entities.get('app', 'the application')}.",
-            "type_text": "Typing the text you requested.",
-            "search_web": f"Searching the web for '{entities.get('query', '')}'.",
-            "send_text": f"Sending a message to {entities.get('target', 'the recipient')}.",
-            "send_email": "Composing and sending the email.",
-            "reply_email": "Composing the email reply.",
-            "browser_task": f"Working on the browser task: {entities.get('instruction', '')[:60]}.",
-            "browser_fill_form": "Filling out the form in the browser.",
-            "browser_click": f"Clicking on {entities.get('element', 'the element')} in the browser.",
-            "browser_extract": "Extracting content from the page.",
-            "close_browser": "Closing the browser.",
-            "open_website": f"Opening {entities.get('url', 'the website')}.",
-            "login": f"Logging into {entities.get('service', 'the service')}.",
-            "mcp_create_reminder": f"Creating a reminder: {entities.get('name', '')}.",
-            "mcp_create_note": f"Creating a note: {entities.get('title', '')}.",
-        }
-
-        return descriptions.get(name, f"Working on your request: {name}.")
+        describe = _PRE_TASK_MESSAGES.get(intent.name)
+        if describe is None:
+            return f"Working on your request: {intent.name}."
+        return describe(intent.entities or {})
 
     def _execute_intent_with_completion(self, intent: Intent, source: str) -> dict[str, Any]:
         """Execute intent and generate completion message."""
@@ -581,19 +674,7 @@ class MaesRuntime:
 
         # Use simple completion message (skip AI call for faster response)
         if result.get("status") == "completed":
-            # Simple, fast completion messages
-            completion_messages = {
-                "open_app": "Done! The app is now open.",
-                "close_app": "Done! The app has been closed.",
-                "open_website": "Done! The website is now open.",
-                "search_web": "Done! Here are your search results.",
-                "type_text": "Done! I've typed the text.",
-                "click": "Done! I've clicked that for you.",
-                "scroll": "Done! I've scrolled the page.",
-                "press_key": "Done! Key pressed.",
-                "hotkey": "Done! Keyboard shortcut activated.",
-            }
-            simple_msg = completion_messages.get(intent.name, "Done!")
+            simple_msg = _COMPLETION_MESSAGES.get(intent.name, "Done!")
             result["message"] = f"{simple_msg} Is there anything else?"
 
         result["pre_task_message"] = pre_msg
@@ -721,9 +802,9 @@ class MaesRuntime:
                 from core.planner.action_planner import ActionStep
                 
                 steps = [
-                    ActionStep("type_text", {"content": cred.username}, False, "Enter username"),
+                    ActionStep("type_text", {"content": cred.username, "sensitive": True}, False, "Enter username"),
                     ActionStep("press_key", {"key": "tab"}, False, "Move to password field"),
-                    ActionStep("type_text", {"content": cred.password}, False, "Enter password"),
+                    ActionStep("type_text", {"content": cred.password, "sensitive": True}, False, "Enter password"),
                 ]
                 
                 result = self.executor.execute_steps(steps, self.guard)
@@ -815,9 +896,9 @@ class MaesRuntime:
     def _handle_emotional_check_in(self, source: str, intent: Intent) -> dict[str, Any]:
         """Full emotional check-in with calendar context."""
         try:
-            import asyncio
-            events, reminders = asyncio.run(
-                self.emotional_intelligence.gather_schedule_data()
+            events, reminders = self._run_async(
+                self.emotional_intelligence.gather_schedule_data(),
+                timeout=_SCHEDULE_FETCH_TIMEOUT,
             )
             affection = self._current_affection or {}
             # Use AffectionAssessment to reconstruct for analysis
@@ -885,9 +966,9 @@ class MaesRuntime:
     def _handle_reschedule_tasks(self, intent: Intent, source: str) -> dict[str, Any]:
         """Handle task rescheduling based on emotional state."""
         try:
-            import asyncio
-            events, reminders = asyncio.run(
-                self.emotional_intelligence.gather_schedule_data()
+            events, reminders = self._run_async(
+                self.emotional_intelligence.gather_schedule_data(),
+                timeout=_SCHEDULE_FETCH_TIMEOUT,
             )
             affection = self._current_affection or {}
             from core.nlu.affection_model import AffectionAssessment
@@ -964,9 +1045,9 @@ class MaesRuntime:
     def _handle_lighten_load(self, intent: Intent, source: str) -> dict[str, Any]:
         """Auto-analyze and suggest load reduction."""
         try:
-            import asyncio
-            events, reminders = asyncio.run(
-                self.emotional_intelligence.gather_schedule_data()
+            events, reminders = self._run_async(
+                self.emotional_intelligence.gather_schedule_data(),
+                timeout=_SCHEDULE_FETCH_TIMEOUT,
             )
             affection = self._current_affection or {}
             from core.nlu.affection_model import AffectionAssessment
@@ -1034,9 +1115,9 @@ class MaesRuntime:
     def _handle_check_schedule(self, intent: Intent, source: str) -> dict[str, Any]:
         """Show schedule with emotional context."""
         try:
-            import asyncio
-            events, reminders = asyncio.run(
-                self.emotional_intelligence.gather_schedule_data()
+            events, reminders = self._run_async(
+                self.emotional_intelligence.gather_schedule_data(),
+                timeout=_SCHEDULE_FETCH_TIMEOUT,
             )
 
             message = "--- Your Schedule ---\n"
@@ -1085,8 +1166,7 @@ class MaesRuntime:
 
         # Handle MCP async actions
         if any(step.action.startswith("mcp_") for step in steps):
-            import asyncio
-            result = asyncio.run(self._execute_mcp_steps(steps))
+            result = self._run_async(self._execute_mcp_steps(steps))
             if result.get("error"):
                 return self._response("error", result["error"], source=source, intent=intent, steps=steps)
             return self._response(
@@ -1099,11 +1179,10 @@ class MaesRuntime:
 
         # Handle browser automation actions
         if any(step.action.startswith("browser_") for step in steps):
-            import asyncio
             for step in steps:
                 if step.action.startswith("browser_"):
                     try:
-                        result = asyncio.run(self._execute_browser_action(step.action, step.params))
+                        result = self._run_async(self._execute_browser_action(step.action, step.params))
                         if result.get("success"):
                             return self._response(
                                 "completed",
@@ -1258,24 +1337,48 @@ class MaesRuntime:
         )
 
     async def _execute_mcp_steps(self, steps: list[Any]) -> dict[str, Any]:
-        """Execute MCP tool calls asynchronously."""
-        try:
-            for step in steps:
-                if step.action == "mcp_create_reminder":
-                    tool = self.mcp_tools.get("reminders_create_reminder")
-                    if not tool:
-                        return {"error": "Reminders tool not available"}
-                    result = await tool(**step.params)
-                    return {"message": f"Created reminder '{result['name']}' in list '{result['list']}'"}
-                elif step.action == "mcp_create_note":
-                    tool = self.mcp_tools.get("notes_create_note")
-                    if not tool:
-                        return {"error": "Notes tool not available"}
-                    result = await tool(**step.params)
-                    return {"message": f"Created note '{result['title']}' in folder '{result['folder']}'"}
+        """Execute MCP tool calls concurrently, reporting results in step order."""
+        # Keyed by (action, canonical params): identical steps run only once,
+        # so a plan that repeats a step doesn't create the same item twice.
+        calls: dict[tuple[str, str], tuple[Any, Any]] = {}
+        for step in steps:
+            entry = _MCP_STEP_TOOLS.get(step.action)
+            if entry is None:
+                continue
+            tool_name, missing_error, required = entry
+            tool = self.mcp_tools.get(tool_name)
+            if not tool:
+                return {"error": missing_error}
+            missing = [param for param in required if not str(step.params.get(param) or "").strip()]
+            if missing:
+                return {"error": f"Cannot run {step.description or step.action}: missing {', '.join(missing)}"}
+            key = (step.action, json.dumps(step.params, sort_keys=True, default=str))
+            calls.setdefault(key, (step, tool))
+
+        if not calls:
             return {"message": "Task completed"}
-        except Exception as e:
-            return {"error": f"MCP execution failed: {str(e)}"}
+
+        # Steps are independent, so wall time is the slowest tool, not the sum.
+        # One failure doesn't hide the others: steps that succeeded are reported
+        # too, so a retry doesn't create them again.
+        results = await asyncio.gather(
+            *(tool(**step.params) for step, tool in calls.values()),
+            return_exceptions=True,
+        )
+
+        messages = []
+        failed = False
+        for (step, _), result in zip(calls.values(), results):
+            if isinstance(result, BaseException):
+                failed = True
+                messages.append(f"Failed: {step.description or step.action}: {result}")
+            elif step.action == "mcp_create_reminder":
+                messages.append(f"Created reminder '{result['name']}' in list '{result['list']}'")
+            else:
+                messages.append(f"Created note '{result['title']}' in folder '{result['folder']}'")
+        if failed:
+            return {"error": "\n".join(messages)}
+        return {"message": "\n".join(messages)}
 
     def _execute_reschedule(self, recommendations: list[dict], source: str) -> dict[str, Any]:
         """Execute the rescheduling of tasks based on recommendations."""
@@ -1290,8 +1393,7 @@ class MaesRuntime:
                 tool = self.mcp_tools.get("reminders_create_reminder")
                 if tool:
                     try:
-                        import asyncio
-                        asyncio.run(tool(
+                        self._run_async(tool(
                             list_name="Reminders",
                             name=f"{task_name} (rescheduled)",
                             body=f"Moved from today due to emotional wellbeing. Original: {task_name}",
@@ -10,6 +10,12 @@ from typing import Any
 
 from dotenv import load_dotenv
 
+try:
+    # Optional: several times faster than json for the per-response payloads
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 # Check pylink folder, then parent folder (hacklahoma26), then CWD
 _PYLINK_DIR = Path(__file__).resolve().parent
@@ -24,6 +30,11 @@ from core.runtime.orchestrator import DEFAULT_PERMISSION_PROFILE, MaesRuntime
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 from bridge import load_plugins
+from core.executor.os_control import set_applescript_runner
+from plugins._osascript import run_applescript as _run_applescript
+
+# Executor AppleScript shares the plugins' long-lived osascript workers
+set_applescript_runner(_run_applescript)
 
 
 _WRITE_LOCK = threading.Lock()
@@ -59,15 +70,32 @@ def _read_json_line() -> dict[str, Any] | None:
     line = line.strip()
     if not line:
         return {}
-    payload = json.loads(line)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers' handling is unchanged
+    payload = orjson.loads(line) if orjson is not None else json.loads(line)
     if not isinstance(payload, dict):
         raise ValueError("Payload must be a JSON object")
     return payload
 
 
+def _dumps(payload: dict[str, Any]) -> str:
+    if orjson is not None:
+        data = orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+        # The Electron side decodes stdout chunk by chunk, so keep the wire
+        # format ASCII-only (as json's ensure_ascii does) to avoid splitting
+        # a multi-byte character across chunks.
+        if data.isascii():
+            return data.decode("ascii")
+    return json.dumps(payload, default=str)
+
+
 def _write_json(payload: dict[str, Any]) -> None:
+    line = _dumps(payload)
     with _WRITE_LOCK:
-        sys.stdout.write(json.dumps(payload, default=str) + "\n")
+        sys.stdout.write(line + "\n")
         sys.stdout.flush()
 
 
@@ -307,6 +335,10 @@ def main() -> int:
         narration_level=narration_level,
         screen_reader_hints_enabled=screen_reader_hints_enabled,
     )
+    # Off by default: warming imports browser_use and makes an LLM API call,
+    # which sessions that never use them shouldn't pay for
+    if _as_bool(os.getenv("MAES_WARM_UP"), default=False):
+        runtime.warm_up_async()
 
     voice_controller = None
     voice_errors: dict[str, str] = {}
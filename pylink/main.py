@@ -22,6 +22,11 @@ from core.runtime.orchestrator import DEFAULT_PERMISSION_PROFILE, MaesRuntime
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 from bridge import load_plugins
+from core.executor.os_control import set_applescript_runner
+from plugins._osascript import run_applescript as _run_applescript
+
+# Executor AppleScript shares the plugins' long-lived osascript workers
+set_applescript_runner(_run_applescript)
 
 
 def _setup_logging() -> None:
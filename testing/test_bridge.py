@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bridge import INDEX_FILENAME, TOOL_TIMEOUTS, PluginAPI, _enabled_plugins, _load_index
+
+
+def _write_plugin(plugins_dir: Path, dir_name: str, manifest: dict) -> None:
+    plugin_dir = plugins_dir / dir_name
+    plugin_dir.mkdir()
+    (plugin_dir / "plugin.json").write_text(json.dumps(manifest))
+
+
+def test_manifest_index_is_written_and_reused(tmp_path):
+    _write_plugin(tmp_path, "alpha_mcp", {"id": "alpha-mcp"})
+    _write_plugin(tmp_path, "beta_mcp", {"id": "beta-mcp", "platforms": ["no-such-os"]})
+    (tmp_path / "not_a_plugin").mkdir()
+
+    index = _load_index(tmp_path)
+    assert sorted(p["id"] for p in index) == ["alpha-mcp", "beta-mcp"]
+    assert (tmp_path / INDEX_FILENAME).exists()
+
+    # A fresh index is served as-is, even if it no longer matches the tree.
+    stale = [{"id": "cached-mcp", "dir": "alpha_mcp", "platforms": None}]
+    index_path = tmp_path / INDEX_FILENAME
+    index_path.write_text(json.dumps(stale))
+    assert _load_index(tmp_path) == stale
+
+    assert _enabled_plugins(tmp_path, {"cached-mcp": {}}) == [("alpha_mcp", "cached-mcp")]
+
+
+def test_manifest_index_rebuilds_when_manifest_changes(tmp_path):
+    _write_plugin(tmp_path, "alpha_mcp", {"id": "alpha-mcp"})
+    _load_index(tmp_path)
+
+    manifest_path = tmp_path / "alpha_mcp" / "plugin.json"
+    manifest_path.write_text(json.dumps({"id": "renamed-mcp"}))
+    index_mtime = os.stat(tmp_path / INDEX_FILENAME).st_mtime
+    os.utime(manifest_path, (index_mtime + 10, index_mtime + 10))
+
+    assert [p["id"] for p in _load_index(tmp_path)] == ["renamed-mcp"]
+
+
+def test_enabled_plugins_filters_config_and_platform(tmp_path):
+    _write_plugin(tmp_path, "alpha_mcp", {"id": "alpha-mcp"})
+    _write_plugin(tmp_path, "beta_mcp", {"id": "beta-mcp", "platforms": ["no-such-os"]})
+    _write_plugin(tmp_path, "gamma_mcp", {"id": "gamma-mcp", "platforms": [sys.platform]})
+
+    enabled = _enabled_plugins(tmp_path, {"alpha-mcp": {}, "beta-mcp": {}, "gamma-mcp": {}})
+    assert sorted(enabled) == [("alpha_mcp", "alpha-mcp"), ("gamma_mcp", "gamma-mcp")]
+
+
+def test_registered_tools_time_out(monkeypatch):
+    monkeypatch.setitem(TOOL_TIMEOUTS, "slow_", 0.01)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def fast(x):
+        return x * 2
+
+    tools = []
+    api = PluginAPI(plugin_config={}, tools=tools)
+    api.register_tool({"name": "slow_tool", "description": "", "fn": slow})
+    api.register_tool({"name": "fast_tool", "description": "", "fn": fast})
+
+    with pytest.raises(TimeoutError, match="slow_tool"):
+        asyncio.run(tools[0]["fn"]())
+    assert asyncio.run(tools[1]["fn"](x=2)) == 4
+
+
+def test_tool_timeout_override(monkeypatch):
+    monkeypatch.setitem(TOOL_TIMEOUTS, "slow_", 0.01)
+
+    async def slowish():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    authorized = []
+    tools = []
+    api = PluginAPI(plugin_config={}, tools=tools)
+    api.register_tool({"name": "slow_send", "description": "", "fn": slowish, "timeout": None})
+    api.register_tool({
+        "name": "slow_read",
+        "description": "",
+        "fn": slowish,
+        "timeout": lambda: 0.01 if authorized else None,
+    })
+
+    assert "timeout" not in tools[0]
+    assert asyncio.run(tools[0]["fn"]()) == "done"
+    assert asyncio.run(tools[1]["fn"]()) == "done"
+    authorized.append(True)
+    with pytest.raises(TimeoutError, match="slow_read"):
+        asyncio.run(tools[1]["fn"]())
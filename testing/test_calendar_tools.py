@@ -0,0 +1,86 @@
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from plugins.calendar_mcp.tools import create_events_tool, delete_events_tool
+
+
+class _FakeRequest:
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+
+    def execute(self):
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class _FakeBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                response = request.execute()
+            except Exception as exc:
+                self.callback(request_id, None, exc)
+            else:
+                self.callback(request_id, response, None)
+
+
+class _FakeCalendar:
+    def __init__(self):
+        self.inserted = []
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body, fields):
+        if body["summary"] == "bad":
+            return _FakeRequest(error=ValueError("Invalid start time."))
+        self.inserted.append(body["summary"])
+        n = len(self.inserted)
+        return _FakeRequest({"id": f"e{n}", "htmlLink": f"https://calendar/e{n}"})
+
+    def delete(self, calendarId, eventId):
+        if eventId == "gone":
+            return _FakeRequest(error=LookupError("Resource has been deleted"))
+        # The API answers a delete with an empty body
+        return _FakeRequest({})
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(callback)
+
+
+def test_create_events_reports_errors_per_event():
+    calendar = _FakeCalendar()
+    fn = create_events_tool(calendar)["fn"]
+    events = [
+        {"summary": "ok", "start_iso": "2026-01-01T09:00:00Z", "end_iso": "2026-01-01T10:00:00Z"},
+        {"start_iso": "2026-01-01T09:00:00Z", "end_iso": "2026-01-01T10:00:00Z"},
+        {"summary": "bad", "start_iso": "x", "end_iso": "y"},
+    ]
+    results = asyncio.run(fn(events=events))
+    assert results[0] == {"id": "e1", "htmlLink": "https://calendar/e1"}
+    assert results[1] == {"created": False, "error": "Missing summary"}
+    assert results[2] == {"created": False, "error": "Invalid start time."}
+    # The incomplete event never reached the batch
+    assert calendar.inserted == ["ok"]
+
+
+def test_delete_events_reports_errors_per_id():
+    fn = delete_events_tool(_FakeCalendar())["fn"]
+    results = asyncio.run(fn(event_ids=["a", "gone", "a"]))
+    assert results == [
+        {"deleted": True, "event_id": "a"},
+        {"deleted": False, "event_id": "gone", "error": "Resource has been deleted"},
+    ]
@@ -0,0 +1,136 @@
+"""
+Test ExecutionEngine step scheduling: overlapping close_app steps, alias-aware
+serialization, and the kill switch waiting for steps already running.
+Run: python -m pytest testing/test_executor_engine.py -v
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add pylink dir so "from core.executor" works (core is under pylink/)
+HACK_ROOT = Path(__file__).resolve().parents[1]
+PYLINK_DIR = HACK_ROOT / "pylink"
+sys.path.insert(0, str(PYLINK_DIR))
+
+from core.executor.engine import ExecutionEngine
+from core.planner.action_planner import ActionStep
+
+
+class _KillSwitch:
+    """Triggers once it has been checked more than `after` times."""
+
+    def __init__(self, after=None):
+        self.after = after
+        self.checks = 0
+
+    def is_triggered(self):
+        self.checks += 1
+        return self.after is not None and self.checks > self.after
+
+
+def _engine(kill_switch=None):
+    engine = ExecutionEngine(kill_switch or _KillSwitch(), verbose=False)
+    engine.base_action_delay = 0
+    engine.os._system = "darwin"
+    return engine
+
+
+def _close(app):
+    return ActionStep("close_app", {"app": app}, False, f"Close {app}")
+
+
+def test_close_app_steps_for_different_apps_overlap():
+    engine = _engine()
+    barrier = threading.Barrier(2, timeout=2)
+    # Each step waits for the other, so this only completes if they overlap
+    engine._handlers["close_app"] = lambda action, params: barrier.wait()
+    try:
+        result = engine.execute_steps([_close("Notes"), _close("Mail")], guard=None)
+    finally:
+        engine.close()
+    assert result.completed
+
+
+def test_close_app_steps_for_the_same_app_never_overlap():
+    engine = _engine()
+    running = []
+    overlapped = []
+    lock = threading.Lock()
+
+    def close_app(action, params):
+        with lock:
+            overlapped.append(bool(running))
+            running.append(params["app"])
+        time.sleep(0.05)
+        with lock:
+            running.remove(params["app"])
+
+    engine._handlers["close_app"] = close_app
+    try:
+        # "chrome" is an alias of "Google Chrome"
+        result = engine.execute_steps([_close("chrome"), _close("Google Chrome"), _close(" CHROME ")], guard=None)
+    finally:
+        engine.close()
+    assert result.completed
+    assert overlapped == [False, False, False]
+
+
+def test_concurrency_key_resolves_aliases():
+    engine = _engine()
+    try:
+        assert engine._concurrency_key(_close("chrome")) == engine._concurrency_key(_close("Google Chrome"))
+        assert engine._concurrency_key(ActionStep("open_app", {"app": "Notes"}, False, "")) is None
+    finally:
+        engine.close()
+
+
+def test_kill_switch_waits_for_running_steps():
+    engine = _engine(_KillSwitch(after=1))
+    finished = []
+
+    def close_app(action, params):
+        time.sleep(0.1)
+        finished.append(params["app"])
+
+    engine._handlers["close_app"] = close_app
+    try:
+        result = engine.execute_steps([_close("Notes"), _close("Mail")], guard=None)
+        # Returned only after the step already started had finished
+        assert finished == ["Notes"]
+    finally:
+        engine.close()
+    assert not result.completed
+
+
+def test_failed_concurrent_step_fails_the_run():
+    engine = _engine()
+
+    def close_app(action, params):
+        if params["app"] == "Mail":
+            raise RuntimeError("not running")
+
+    engine._handlers["close_app"] = close_app
+    try:
+        result = engine.execute_steps([_close("Notes"), _close("Mail")], guard=None)
+    finally:
+        engine.close()
+    assert not result.completed
+
+
+def test_close_waits_for_pooled_steps():
+    engine = _engine()
+    started = threading.Event()
+    finished = []
+
+    def slow(action, params):
+        started.set()
+        time.sleep(0.1)
+        finished.append(True)
+
+    future = engine._pool.submit(slow, "close_app", {})
+    started.wait(1)
+    engine.close()
+    assert finished == [True]
+    assert future.done()
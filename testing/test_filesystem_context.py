@@ -0,0 +1,163 @@
+"""
+Test FileSystemContext indexing, incremental re-indexing and the search cache.
+Run: python -m pytest testing/test_filesystem_context.py -v
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add pylink dir so "from core.context" works (core is under pylink/)
+HACK_ROOT = Path(__file__).resolve().parents[1]
+PYLINK_DIR = HACK_ROOT / "pylink"
+sys.path.insert(0, str(PYLINK_DIR))
+
+from core.context.filesystem_context import FileSystemContext
+
+
+def _write(path: Path, text: str = "x", mtime: float | None = None) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _context(root: Path, **kwargs) -> FileSystemContext:
+    return FileSystemContext(search_paths=[str(root)], **kwargs)
+
+
+def _names(files) -> list[str]:
+    return [f.name for f in files]
+
+
+def test_index_skips_excluded_dirs_and_unknown_extensions(tmp_path):
+    _write(tmp_path / "notes.md", mtime=1_000)
+    _write(tmp_path / "deep" / "er" / "report.pdf", mtime=2_000)
+    _write(tmp_path / "node_modules" / "pkg.js")
+    _write(tmp_path / ".git" / "config.json")
+    _write(tmp_path / "binary.exe")
+    _write(tmp_path / ".bashrc")
+
+    fs = _context(tmp_path)
+    assert fs.index_files() == 2
+    # Newest first
+    assert _names(fs.indexed_files) == ["report.pdf", "notes.md"]
+    assert fs.find_exact_file("NOTES.MD").name == "notes.md"
+    assert _names(fs.get_files_by_extension(".pdf")) == ["report.pdf"]
+
+
+def test_index_keeps_newest_max_files(tmp_path):
+    for i in range(5):
+        _write(tmp_path / f"f{i}.txt", mtime=1_000 + i)
+
+    fs = _context(tmp_path, max_files=3)
+    fs.index_files()
+    assert _names(fs.indexed_files) == ["f4.txt", "f3.txt", "f2.txt"]
+
+
+def test_index_files_only_reindexes_when_forced(tmp_path):
+    _write(tmp_path / "a.txt")
+    fs = _context(tmp_path)
+    fs.index_files()
+
+    _write(tmp_path / "b.txt")
+    assert fs.index_files() == 1
+    assert fs.index_files(force=True) == 2
+
+
+def test_reindex_picks_up_changes_and_reuses_unchanged_files(tmp_path):
+    _write(tmp_path / "keep.txt", mtime=1_000)
+    edited = _write(tmp_path / "sub" / "edit.txt", "old", mtime=1_000)
+    removed = _write(tmp_path / "sub" / "gone.txt", mtime=1_000)
+
+    fs = _context(tmp_path)
+    fs.index_files()
+    before = {f.name: f for f in fs.indexed_files}
+
+    # Edit in place (the directory's mtime doesn't change), remove a file and
+    # add one in a new directory
+    _write(edited, "new content", mtime=2_000)
+    removed.unlink()
+    _write(tmp_path / "added" / "new.txt", mtime=3_000)
+
+    fs.index_files(force=True)
+    after = {f.name: f for f in fs.indexed_files}
+
+    assert sorted(after) == ["edit.txt", "keep.txt", "new.txt"]
+    assert after["keep.txt"] is before["keep.txt"]
+    assert after["edit.txt"] is not before["edit.txt"]
+    assert after["edit.txt"].size == len("new content")
+
+
+def test_reindex_notices_in_place_edits_in_unchanged_directories(tmp_path):
+    target = _write(tmp_path / "a.txt", "1", mtime=1_000)
+    fs = _context(tmp_path)
+    fs.index_files()
+
+    dir_mtime = os.stat(tmp_path).st_mtime_ns
+    _write(target, "22", mtime=2_000)
+    os.utime(tmp_path, ns=(dir_mtime, dir_mtime))
+
+    fs.index_files(force=True)
+    assert fs.indexed_files[0].size == 2
+    assert fs.indexed_files[0].mtime == 2_000
+
+
+def test_search_puts_name_prefix_matches_first(tmp_path):
+    _write(tmp_path / "my_report.txt", mtime=3_000)
+    _write(tmp_path / "report_a.txt", mtime=1_000)
+    _write(tmp_path / "report_b.txt", mtime=2_000)
+    _write(tmp_path / "reports" / "summary.txt", mtime=4_000)
+
+    fs = _context(tmp_path)
+    fs.index_files()
+    assert _names(fs.search_files("REPORT")) == ["report_b.txt", "report_a.txt", "summary.txt", "my_report.txt"]
+    assert _names(fs.search_files("report", limit=1)) == ["report_b.txt"]
+
+
+def test_multi_word_search_ranks_files_with_every_word_first(tmp_path):
+    _write(tmp_path / "tax" / "2024.pdf", mtime=1_000)
+    _write(tmp_path / "tax" / "notes.txt", mtime=2_000)
+
+    fs = _context(tmp_path)
+    fs.index_files()
+    assert _names(fs.search_files("tax 2024")) == ["2024.pdf", "notes.txt"]
+
+
+def test_search_cache_hits_until_reindex(tmp_path, monkeypatch):
+    _write(tmp_path / "alpha.txt")
+    fs = _context(tmp_path)
+    fs.index_files()
+
+    calls = []
+    match_index = fs._match_index
+    monkeypatch.setattr(fs, "_match_index", lambda *args: calls.append(args) or match_index(*args))
+
+    first = fs.search_files("alpha")
+    # Callers get their own list; mutating it doesn't touch the cache
+    first.clear()
+    assert _names(fs.search_files("ALPHA")) == ["alpha.txt"]
+    assert len(calls) == 1
+
+    # A different limit is a different entry
+    fs.search_files("alpha", limit=5)
+    assert len(calls) == 2
+
+    _write(tmp_path / "alpha2.txt")
+    fs.index_files(force=True)
+    assert sorted(_names(fs.search_files("alpha"))) == ["alpha.txt", "alpha2.txt"]
+    assert len(calls) == 3
+
+
+def test_context_summary_is_rebuilt_after_reindex(tmp_path):
+    _write(tmp_path / "a.txt")
+    fs = _context(tmp_path)
+    fs.index_files()
+    summary = fs.get_context_summary()
+    assert summary.startswith("Indexed 1 files")
+    assert fs.get_context_summary() is summary
+
+    _write(tmp_path / "b.txt")
+    fs.index_files(force=True)
+    assert fs.get_context_summary().startswith("Indexed 2 files")
@@ -0,0 +1,162 @@
+import asyncio
+import base64
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from plugins.gmail_mcp.tools import (
+    _decode_body,
+    _format_message,
+    _raw_message,
+    get_messages_tool,
+    list_and_fetch_tool,
+)
+
+
+def _b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def test_decode_body_finds_plain_text_in_nested_multipart():
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {
+                "mimeType": "multipart/alternative",
+                "parts": [
+                    {"mimeType": "text/html", "body": {"data": _b64("<b>hi</b>")}},
+                    {"mimeType": "text/plain", "body": {"data": _b64("hi")}},
+                ],
+            },
+            {"mimeType": "application/pdf", "body": {"attachmentId": "a1"}},
+        ],
+    }
+    assert _decode_body(payload) == "hi"
+
+
+def test_decode_body_falls_back_to_html_as_text():
+    markup = "<style>p {}</style><p>Hello&nbsp;<b>there</b></p><p>Bye &amp; thanks</p>"
+    assert _decode_body({"mimeType": "text/html", "body": {"data": _b64(markup)}}) == "Hello there\nBye & thanks"
+    assert _decode_body({}) == ""
+
+
+def test_decode_body_skips_attachments():
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {"mimeType": "application/octet-stream", "body": {"data": _b64("\x00binary")}},
+            {"mimeType": "text/plain", "filename": "notes.txt", "body": {"data": _b64("attached")}},
+            {"mimeType": "text/html", "body": {"data": _b64("<p>body</p>")}},
+        ],
+    }
+    assert _decode_body(payload) == "body"
+
+
+def test_format_message_reads_headers_case_insensitively():
+    msg = {
+        "id": "m1",
+        "threadId": "t1",
+        "snippet": "snip",
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "SUBJECT", "value": "Hello"},
+                {"name": "from", "value": "a@example.com"},
+                {"name": "Subject", "value": "ignored duplicate"},
+            ],
+            "body": {"data": _b64("body")},
+        },
+    }
+    formatted = _format_message(msg)
+    assert formatted["subject"] == "Hello"
+    assert formatted["from"] == "a@example.com"
+    assert formatted["to"] == ""
+    assert formatted["body"] == "body"
+
+
+def test_raw_message_builds_utf8_plain_text():
+    raw = base64.urlsafe_b64decode(_raw_message("a@example.com", "Hi", "héllo"))
+    headers, _, body = raw.partition(b"\r\n\r\n")
+    assert b"To: a@example.com" in headers
+    assert b"Subject: Hi" in headers
+    assert b"charset=utf-8" in headers
+    assert body.decode("utf-8") == "héllo"
+
+
+def test_raw_message_rejects_header_injection():
+    with pytest.raises(ValueError):
+        _raw_message("a@example.com\r\nBcc: evil@example.com", "Hi", "x")
+
+
+class _FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class _FailingRequest:
+    def __init__(self, error):
+        self.error = error
+
+    def execute(self):
+        raise self.error
+
+
+class _FakeBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                response = request.execute()
+            except Exception as exc:
+                self.callback(request_id, None, exc)
+            else:
+                self.callback(request_id, response, None)
+
+
+class _FakeGmail:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, **params):
+        return _FakeRequest({"messages": [{"id": i} for i in self.ids[: params["maxResults"]]]})
+
+    def get(self, userId, id, **params):
+        if id == "missing":
+            return _FailingRequest(LookupError("Requested entity was not found."))
+        return _FakeRequest({"id": id, "payload": {"headers": [{"name": "Subject", "value": id.upper()}]}})
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(callback)
+
+
+def test_list_and_fetch_returns_full_messages_in_list_order():
+    fn = list_and_fetch_tool(_FakeGmail(["b", "a", "c"]))["fn"]
+    messages = asyncio.run(fn(max_results=2))
+    assert [m["id"] for m in messages] == ["b", "a"]
+    assert [m["subject"] for m in messages] == ["B", "A"]
+
+
+def test_get_messages_reports_failed_ids():
+    fn = get_messages_tool(_FakeGmail([]))["fn"]
+    messages = asyncio.run(fn(ids=["a", "missing"]))
+    assert messages[0]["subject"] == "A"
+    assert messages[1] == {"id": "missing", "fetched": False, "error": "Requested entity was not found."}
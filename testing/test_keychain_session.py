@@ -0,0 +1,113 @@
+"""
+Test the persistent `security -i` session behind macOS Keychain lookups.
+A small Python script stands in for `security`, so this runs on any platform.
+Run: python -m pytest testing/test_keychain_session.py -v
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add pylink dir so "from core.context" works (core is under pylink/)
+HACK_ROOT = Path(__file__).resolve().parents[1]
+PYLINK_DIR = HACK_ROOT / "pylink"
+sys.path.insert(0, str(PYLINK_DIR))
+
+from core.context import password_manager as pm_module
+from core.context.password_manager import PasswordManager
+
+# Answers like `security -i`: a prompt, then one reply per command line.
+# "hang" in a command never answers, like an unanswered Keychain prompt.
+_FAKE_SECURITY = r'''
+import sys, time
+out = sys.stdout
+out.write("security> "); out.flush()
+for line in sys.stdin:
+    if "hang" in line:
+        time.sleep(60)
+    service = line.split('-s ')[1].split()[0]
+    out.write('keychain: "login"\n    "acct"<blob>="user@' + service + '"\n')
+    out.write('password: "pw-' + service + '"\n')
+    out.write("security> "); out.flush()
+'''
+
+
+@pytest.fixture
+def fake_security(monkeypatch):
+    started = []
+    real_popen = subprocess.Popen
+
+    def popen(args, **kwargs):
+        assert args == ["security", "-i"]
+        proc = real_popen([sys.executable, "-c", _FAKE_SECURITY], **kwargs)
+        started.append(proc)
+        return proc
+
+    def no_fallback(*args, **kwargs):
+        raise AssertionError(f"unexpected one-off security call: {args}")
+
+    monkeypatch.setattr(pm_module.subprocess, "Popen", popen)
+    monkeypatch.setattr(pm_module.subprocess, "run", no_fallback)
+    manager = PasswordManager()
+    yield manager, started
+    manager.close()
+
+
+def test_lookups_share_one_session(fake_security):
+    manager, started = fake_security
+    first = manager._find_keychain_credential("inet", "github.com")
+    second = manager._find_keychain_credential("genp", "gitlab")
+
+    assert (first.username, first.password) == ("user@github.com", "pw-github.com")
+    assert (second.username, second.password) == ("user@gitlab", "pw-gitlab")
+    assert len(started) == 1
+
+
+def test_close_stops_the_session(fake_security):
+    manager, started = fake_security
+    manager._find_keychain_credential("inet", "github.com")
+    manager.close()
+    assert started[0].poll() is not None
+    assert manager._security_proc is None
+
+
+def test_unanswered_lookup_times_out_without_a_second_prompt(fake_security, monkeypatch):
+    manager, started = fake_security
+    monkeypatch.setattr(pm_module, "_KEYCHAIN_PROMPT_TIMEOUT", 0.3)
+
+    # The fixture fails the test if the one-off fallback runs
+    assert manager._find_keychain_credential("inet", "hang.example") is None
+    assert started[0].poll() is not None
+    assert manager._security_proc is None
+
+    # The next lookup starts a fresh session
+    assert manager._find_keychain_credential("inet", "github.com").password == "pw-github.com"
+    assert len(started) == 2
+
+
+def test_falls_back_to_one_off_command_when_session_cannot_start(monkeypatch):
+    calls = []
+
+    def popen(*args, **kwargs):
+        raise OSError("security not found")
+
+    def run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(
+            args, 0, stdout='    "acct"<blob>="me"\n', stderr='password: "secret"\n'
+        )
+
+    monkeypatch.setattr(pm_module.subprocess, "Popen", popen)
+    monkeypatch.setattr(pm_module.subprocess, "run", run)
+    cred = PasswordManager()._find_keychain_credential("genp", "example")
+
+    assert (cred.username, cred.password) == ("me", "secret")
+    assert calls == [["security", "find-generic-password", "-s", "example", "-g"]]
+
+
+def test_arguments_that_cannot_be_quoted_skip_the_session():
+    manager = PasswordManager()
+    assert manager._security_command(["find-generic-password", "-s", 'a"b']) is None
+    assert manager._security_proc is None
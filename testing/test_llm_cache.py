@@ -0,0 +1,154 @@
+"""
+Test the LLM response cache and the compaction of older assistant replies.
+A fake client stands in for OpenAI, so no API key or network is needed.
+Run: python -m pytest testing/test_llm_cache.py -v
+"""
+
+import json
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add pylink dir so "from core.nlu" works (core is under pylink/)
+HACK_ROOT = Path(__file__).resolve().parents[1]
+PYLINK_DIR = HACK_ROOT / "pylink"
+sys.path.insert(0, str(PYLINK_DIR))
+
+from core.nlu import llm_brain
+from core.nlu.llm_brain import ConversationalAI, OpenAIBrain
+
+_MESSAGES = [{"role": "user", "content": "open notes"}]
+
+
+class _FakeClient:
+    """Returns the queued replies in order and counts API calls."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=self.replies.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _conversational(client):
+    ai = ConversationalAI.__new__(ConversationalAI)
+    ai.client = client
+    ai.model_id = "test-model"
+    ai.conversation_history = []
+    ai.pending_action = None
+    return ai
+
+
+def _brain(client):
+    brain = OpenAIBrain.__new__(OpenAIBrain)
+    brain.client = client
+    brain.model_id = "test-model"
+    return brain
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(llm_brain, "_response_cache", OrderedDict())
+
+
+def test_cache_key_depends_on_every_request_field():
+    key = llm_brain._response_cache_key("m", _MESSAGES, 0.1, 256)
+    assert key == llm_brain._response_cache_key("m", [dict(_MESSAGES[0])], 0.1, 256)
+    assert key != llm_brain._response_cache_key("other", _MESSAGES, 0.1, 256)
+    assert key != llm_brain._response_cache_key("m", [{"role": "user", "content": "open mail"}], 0.1, 256)
+    assert key != llm_brain._response_cache_key("m", _MESSAGES, 0.3, 256)
+    assert key != llm_brain._response_cache_key("m", _MESSAGES, 0.1, 512)
+
+
+def test_sampled_requests_are_never_cached():
+    key = llm_brain._response_cache_key("m", _MESSAGES, llm_brain._MAX_CACHEABLE_TEMPERATURE + 0.1, 256)
+    assert key is None
+    llm_brain._store_response(key, "{}")
+    assert llm_brain._get_cached_response(key) is None
+    assert not llm_brain._response_cache
+
+
+def test_least_recently_used_reply_is_evicted(monkeypatch):
+    monkeypatch.setattr(llm_brain, "_RESPONSE_CACHE_SIZE", 2)
+    llm_brain._store_response("a", "reply a")
+    llm_brain._store_response("b", "reply b")
+    # Reading "a" makes "b" the oldest entry
+    assert llm_brain._get_cached_response("a") == "reply a"
+    llm_brain._store_response("c", "reply c")
+
+    assert llm_brain._get_cached_response("b") is None
+    assert llm_brain._get_cached_response("a") == "reply a"
+    assert llm_brain._get_cached_response("c") == "reply c"
+
+
+def test_parse_reuses_the_reply_to_an_identical_request():
+    reply = json.dumps({"intent": "open_app", "entities": {"app": "Notes"}, "confidence": 0.9})
+    client = _FakeClient("```json\n" + reply + "\n```")
+    brain = _brain(client)
+
+    first = brain.parse("open notes")
+    second = brain.parse("open notes")
+    assert client.calls == 1
+    assert (second.name, second.entities) == (first.name, first.entities) == ("open_app", {"app": "Notes"})
+    # The cleaned-up reply is what gets stored
+    assert list(llm_brain._response_cache.values()) == [reply]
+
+
+def test_unparsable_replies_are_not_cached():
+    reply = json.dumps({"intent": "open_app", "entities": {"app": "Notes"}})
+    client = _FakeClient("not json", reply)
+    brain = _brain(client)
+
+    assert brain.parse("open notes").name == "unknown"
+    assert not llm_brain._response_cache
+    assert brain.parse("open notes").name == "open_app"
+    assert client.calls == 2
+
+
+def test_analyze_request_reuses_the_reply_to_an_identical_conversation():
+    reply = json.dumps({"status": "ready", "intent": "open_app", "entities": {"app": "Notes"}})
+    client = _FakeClient(reply)
+
+    assert _conversational(client).analyze_request("open notes")["intent"] == "open_app"
+    # A new conversation sends the same messages, so the stored reply is used
+    assert _conversational(client).analyze_request("open notes")["intent"] == "open_app"
+    assert client.calls == 1
+
+
+def test_compact_reply_keeps_only_the_decision():
+    reply = json.dumps({
+        "status": "ready",
+        "intent": "open_app",
+        "entities": {"app": "Notes"},
+        "confidence": 0.9,
+        "user_message": "Opening Notes for you!",
+    })
+    assert json.loads(llm_brain._compact_reply(reply)) == {
+        "status": "ready",
+        "intent": "open_app",
+        "entities": {"app": "Notes"},
+    }
+
+
+def test_compact_reply_truncates_text_that_is_not_a_json_object():
+    text = "x" * (llm_brain._COMPACT_REPLY_MAX_CHARS + 50)
+    assert llm_brain._compact_reply(text) == "x" * llm_brain._COMPACT_REPLY_MAX_CHARS
+    assert llm_brain._compact_reply("[1, 2]") == "[1, 2]"
+
+
+def test_only_older_assistant_replies_are_compacted():
+    first = json.dumps({"status": "ready", "intent": "open_app", "entities": {}, "user_message": "Opening"})
+    second = json.dumps({"status": "ready", "intent": "close_app", "entities": {}, "user_message": "Closing"})
+    ai = _conversational(_FakeClient(first, second))
+
+    ai.analyze_request("open notes")
+    ai.analyze_request("close notes")
+    assistant = [turn.content for turn in ai.conversation_history if turn.role == "assistant"]
+    assert assistant == [llm_brain._compact_reply(first), second]
@@ -0,0 +1,135 @@
+"""
+Test the Python side of the shared osascript worker protocol (plugins/_osascript.py).
+A small Python script stands in for the JXA worker, so this runs on any platform.
+Run: python -m pytest testing/test_osascript.py -v
+"""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from plugins import _osascript
+
+# Speaks the worker protocol: one JSON-encoded script per line in, one JSON
+# reply per line out. The "script" is a command for the stand-in.
+_FAKE_WORKER = r'''
+import json, sys, time
+for line in sys.stdin:
+    script = json.loads(line)
+    if script == "hang":
+        time.sleep(60)
+    elif script == "exit":
+        sys.exit(0)
+    elif script.startswith("fail "):
+        reply = {"ok": False, "error": script[5:]}
+    else:
+        reply = {"ok": True, "result": " " + script + "\n"}
+    sys.stdout.write(json.dumps(reply) + "\n")
+    sys.stdout.flush()
+'''
+
+
+@pytest.fixture
+def fake_worker(monkeypatch):
+    started = []
+
+    def start_worker():
+        proc = subprocess.Popen(
+            [sys.executable, "-c", _FAKE_WORKER],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        started.append(proc)
+        return proc
+
+    def no_oneshot(*args, **kwargs):
+        raise AssertionError("unexpected one-shot osascript")
+
+    monkeypatch.setattr(_osascript, "_start_worker", start_worker)
+    monkeypatch.setattr(_osascript, "_run_oneshot", no_oneshot)
+    _osascript._stop_worker()
+    yield started
+    _osascript._stop_worker()
+
+
+def test_scripts_reuse_one_worker(fake_worker):
+    assert _osascript.run_applescript("first") == "first"
+    # Newlines and quotes survive the JSON line framing
+    assert _osascript.run_applescript('say "hi"\nagain') == 'say "hi"\nagain'
+    assert len(fake_worker) == 1
+
+
+def test_script_errors_raise_runtime_error(fake_worker):
+    with pytest.raises(RuntimeError, match="Can't get folder"):
+        _osascript.run_applescript("fail Can't get folder")
+    # The worker is still usable afterwards
+    assert _osascript.run_applescript("ok") == "ok"
+    assert len(fake_worker) == 1
+
+
+def test_timeout_stops_the_worker(fake_worker):
+    with pytest.raises(_osascript.AppleScriptTimeout):
+        _osascript.run_applescript("hang", timeout=0.2)
+    assert fake_worker[0].poll() is not None
+    # A late reply can't be mistaken for the next script's: a new worker runs it
+    assert _osascript.run_applescript("next") == "next"
+    assert len(fake_worker) == 2
+
+
+def test_worker_exit_is_reported_and_replaced(fake_worker):
+    with pytest.raises(RuntimeError, match="exited"):
+        _osascript.run_applescript("exit")
+    assert _osascript.run_applescript("again") == "again"
+    assert len(fake_worker) == 2
+
+
+def test_falls_back_to_oneshot_when_worker_cannot_start(monkeypatch):
+    def start_worker():
+        raise OSError("osascript not found")
+
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout="done\n", stderr="")
+
+    monkeypatch.setattr(_osascript, "_start_worker", start_worker)
+    monkeypatch.setattr(_osascript.subprocess, "run", run)
+    _osascript._stop_worker()
+
+    assert _osascript.run_applescript("script") == "done"
+    assert calls == [["osascript", "-e", "script"]]
+
+
+def test_oneshot_timeout_raises_applescript_timeout(monkeypatch):
+    def run(args, **kwargs):
+        raise subprocess.TimeoutExpired(args, kwargs["timeout"])
+
+    monkeypatch.setattr(_osascript.subprocess, "run", run)
+    with pytest.raises(_osascript.AppleScriptTimeout):
+        _osascript._run_oneshot("script", 1)
+
+
+def test_run_uses_the_osascript_pool(fake_worker):
+    async def main():
+        return await asyncio.gather(*(_osascript.run(f"s{i}") for i in range(6)))
+
+    assert asyncio.run(main()) == [f"s{i}" for i in range(6)]
+    # One worker per pool thread at most
+    assert 1 <= len(fake_worker) <= _osascript.POOL_WORKERS
+
+
+def test_escape_and_names_script():
+    assert _osascript.escape("plain") == "plain"
+    assert _osascript.escape('a "b" \\c') == 'a \\"b\\" \\\\c'
+    script = _osascript.names_script("Notes", "name of every folder")
+    assert script.startswith('tell application "Notes"\n')
+    assert "text item delimiters to linefeed" in script
+    assert "(name of every folder) as text" in script